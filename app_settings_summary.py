@@ -360,12 +360,12 @@ def create_excel_summary(app_summaries, output_file=None):
     
     return str(output_file)
 
-def main():
-    """メイン関数"""
+def main(argv=None):
+    """メイン関数（argv を省略した場合は sys.argv[1:] を解析）"""
     # コマンドライン引数の解析
     parser = argparse.ArgumentParser(description='Kintoneアプリの全体設定一覧表をエクセルで出力するスクリプト')
     parser.add_argument('--output', type=str, help='出力ファイル名')
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # ロギングの設定
     logger = setup_logging()
@@ -8,12 +8,28 @@ KintoneのAPIクライアント
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 
+# 一時的なエラー（レート制限・サーバーエラー）は指数バックオフで再試行する
+HTTP_RETRY = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+
+def create_session():
+    """
+    接続プールと再試行を設定した requests.Session を作成する
+    複数の KintoneClient で共有すると、TLS接続を使い回せる
+    """
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=HTTP_RETRY))
+    return session
+
 class KintoneClient:
-    def __init__(self, domain, api_token):
+    def __init__(self, domain, api_token, session=None):
         self.domain = domain
         self.api_token = api_token
+        # APIトークンはアプリごとに異なるため、ヘッダーはセッションではなくリクエストごとに渡す
+        self.session = session or create_session()
         self.base_url = f"https://{domain}.cybozu.com/k/v1"
         self.headers = {
             "X-Cybozu-API-Token": api_token,
@@ -24,7 +40,7 @@ class KintoneClient:
         """アプリの設定を取得する"""
         url = f"{self.base_url}/app/settings.json"
         params = {"app": app_id}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -32,7 +48,7 @@ class KintoneClient:
         """アプリのフィールド設定を取得する"""
         url = f"{self.base_url}/app/form/fields.json"
         params = {"app": app_id}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -40,7 +56,7 @@ class KintoneClient:
         """アプリのビュー設定を取得する"""
         url = f"{self.base_url}/app/views.json"
         params = {"app": app_id}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -48,7 +64,7 @@ class KintoneClient:
         """アプリのアクセス権限設定を取得する"""
         url = f"{self.base_url}/app/acl.json"
         params = {"app": app_id}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -56,7 +72,7 @@ class KintoneClient:
         """アプリの通知設定を取得する"""
         url = f"{self.base_url}/app/notifications.json"
         params = {"app": app_id}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -64,7 +80,7 @@ class KintoneClient:
         """アプリのステータス設定を取得する"""
         url = f"{self.base_url}/app/status.json"
         params = {"app": app_id}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json()
 
@@ -72,6 +88,6 @@ class KintoneClient:
         """アプリのカスタマイズ設定を取得する"""
         url = f"{self.base_url}/app/customize.json"
         params = {"app": app_id}
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json() 
\ No newline at end of file
@@ -10,6 +10,9 @@ import csv
 import logging
 from collections import Counter
 
+# libyaml が利用できる場合はC実装のローダーでYAMLを読み込む（動作は yaml.safe_load と同じ）
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # 縦書きの定数を定義
 VERTICAL_TEXT_JAPANESE = 255  # 日本語の縦書き
 VERTICAL_TEXT_LEFT_TO_RIGHT = 90  # 左から右への縦書き
@@ -66,7 +69,7 @@ def load_master_status(header_name, base_dir):
   master_file = os.path.join(base_dir, f"{header_name}_process_management.yaml")
   try:
     with open(master_file, 'r', encoding='utf-8') as f:
-      master_data = yaml.safe_load(f)
+      master_data = yaml.load(f, Loader=YAML_LOADER)
       if not master_data.get('enable', True):
         logging.debug("プロセス管理が無効です")
         return set()
@@ -89,7 +92,7 @@ def load_group_list(group_master_path):
   """
   try:
     with open(group_master_path, 'r', encoding='utf-8') as f:
-      group_data = yaml.safe_load(f)
+      group_data = yaml.load(f, Loader=YAML_LOADER)
       # グループデータから name フィールドのみを抽出
       return {code: info['name'] for code, info in group_data.items()}
   except Exception as e:
@@ -110,7 +113,7 @@ def load_form_fields(header_name, base_dir):
   form_fields_file = os.path.join(base_dir, f"{header_name}_form_fields.yaml")
   try:
     with open(form_fields_file, 'r', encoding='utf-8') as f:
-      form_fields_data = yaml.safe_load(f)
+      form_fields_data = yaml.load(f, Loader=YAML_LOADER)
       field_entities = {}
       for field_code, field_info in form_fields_data.get('properties', {}).items():
         label = field_info.get('label', field_code)
@@ -136,7 +139,7 @@ def load_entity_type_map(header_name, base_dir):
   record_acl_file = os.path.join(base_dir, f"{header_name}_record_acl.yaml")
   try:
     with open(record_acl_file, 'r', encoding='utf-8') as f:
-      record_acl_data = yaml.safe_load(f)
+      record_acl_data = yaml.load(f, Loader=YAML_LOADER)
       entity_type_map = {}
       for rights_block in record_acl_data.get('rights', []):
         for entity in rights_block.get('entities', []):
@@ -180,7 +183,7 @@ def load_userValid_list(user_list_path):
   """
   try:
     with open(user_list_path, 'r', encoding='utf-8') as f:
-      user_data = yaml.safe_load(f)
+      user_data = yaml.load(f, Loader=YAML_LOADER)
       user_map = {}
       for key, user_info in user_data.items():
         code = user_info.get('code')
@@ -204,7 +207,7 @@ def load_userName_list(group_master_path):
   """
   try:
     with open(group_master_path, 'r', encoding='utf-8') as f:
-      group_data = yaml.safe_load(f)
+      group_data = yaml.load(f, Loader=YAML_LOADER)
       user_map = {}
       
       # 全グループをループして、ユニークなユーザー情報を収集
@@ -451,7 +454,7 @@ def convert_yaml_to_excel(wb, header_name, base_dir, group_map, entity_type_map,
   # YAMLファイルの読み込み
   try:
     with open(input_file, 'r', encoding='utf-8') as f:
-      data = yaml.safe_load(f)
+      data = yaml.load(f, Loader=YAML_LOADER)
   except Exception as e:
     logging.error(f"エラー: {acl_type}_aclファイル {input_file} の読み込みに失敗しました: {str(e)}")
     return
@@ -803,7 +806,7 @@ def convert_app_acl_to_excel(wb, header_name, base_dir, group_map, entity_type_m
   # YAMLファイルの読み込み
   try:
     with open(input_file, 'r', encoding='utf-8') as f:
-      data = yaml.safe_load(f)
+      data = yaml.load(f, Loader=YAML_LOADER)
   except Exception as e:
     logging.error(f"エラー: app_aclファイル {input_file} の読み込みに失敗しました: {str(e)}")
     return
@@ -1119,7 +1122,7 @@ def load_group_members(group_list_path):
   """
   try:
     with open(group_list_path, 'r', encoding='utf-8') as f:
-      return yaml.safe_load(f)
+      return yaml.load(f, Loader=YAML_LOADER)
   except Exception as e:
     logging.warning(f"警告: group_user_list.yaml の読み込みに失敗しました: {str(e)}")
     return {}
@@ -1138,9 +1141,12 @@ def print_group_members(group_data):
             logging.debug(f"    メールアドレス: {user['email']}")
             logging.debug(f"    ID: {user['id']}")
 
-def main():
+def main(argv=None):
   """
   スクリプトのエントリーポイント
+
+  Args:
+      argv (list, optional): コマンドライン引数（省略時は sys.argv[1:]）
   """
   parser = argparse.ArgumentParser(description='YAMLファイルをExcelファイルに変換するスクリプト')
   parser.add_argument('header_name', type=str, help='ヘッダー名 (例: 14)')
@@ -1152,7 +1158,7 @@ def main():
   parser.add_argument('--silent', action='store_true', help='ログ出力を抑制する')
   parser.add_argument('--output', '-o', type=str, help='出力するExcelファイルのパス')
 
-  args = parser.parse_args()
+  args = parser.parse_args(argv)
 
   # ロギングの設定
   setup_logging(args.log_level, args.silent)
@@ -1219,9 +1225,9 @@ def main():
   # record_aclとapp_aclファイルからエンティティを読み込む
   try:
     with open(record_acl_file, 'r', encoding='utf-8') as f:
-      record_data = yaml.safe_load(f)
+      record_data = yaml.load(f, Loader=YAML_LOADER)
     with open(app_acl_file, 'r', encoding='utf-8') as f:
-      app_data = yaml.safe_load(f)
+      app_data = yaml.load(f, Loader=YAML_LOADER)
       
     # 両方のファイルからエンティティを抽出
     record_entities = set(get_all_entities(record_data))
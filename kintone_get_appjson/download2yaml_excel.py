@@ -1,6 +1,8 @@
 import os
 import sys
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import yaml
 import json
 import re
@@ -18,8 +20,27 @@ from openpyxl.utils.cell import column_index_from_string, get_column_letter, coo
 from typing import Union
 from urllib.parse import urlparse
 
+try:
+    import orjson
+except ImportError:
+    # orjson が無い環境では標準ライブラリの json で解析する
+    orjson = None
+
 BASE_DIR_NAME = '___base___'
 
+def _create_session():
+    """
+    kintone への HTTP 接続を使い回すためのセッションを作成する
+    一時的なエラー（429/5xx）は間隔を空けて再試行し、最終的な応答は従来どおり raise_for_status で判定する
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+    session.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry))
+    return session
+
+# 同一プロセス内で複数アプリを処理する場合もTLS接続を再利用できるよう、モジュールで共有する
+HTTP_SESSION = _create_session()
+
 # グローバル変数
 EXIT_ON_ERROR = True  # エラー時に終了するかどうかのフラグ
 
@@ -36,6 +57,16 @@ def exit_with_error(message: str = "処理を中断します"):
     else:
         print("EXIT_ON_ERROR=False のため、処理を継続します")
 
+def json_loads(data):
+    """JSON文字列（またはバイト列）を解析する（orjson が利用できればC実装で高速に解析する）
+
+    Args:
+        data (str | bytes): JSON文字列
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 # ─── 補助関数 ─────────────────────────────────────────────
 def process_file(layout_file_path, fields_file_path, output_file):
     """レイアウトファイルとフィールドファイルを処理してTSVを生成"""
@@ -682,7 +713,7 @@ class PropertyFieldMapper:
 
         try:
             with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = json_loads(f.read())
         except json.JSONDecodeError as e:
             raise ValueError(f"JSONの読み込みに失敗しました: {e}")
 
@@ -819,12 +850,12 @@ class KintoneApp:
             # レコード通知設定の場合、POSTメソッドとリクエストボディが必要
             if "perRecord.json" in url:
                 data = {"app": self.appid}
-                response = requests.get(url, headers=headers, json=data)
+                response = HTTP_SESSION.get(url, headers=headers, json=data)
             else:
-                response = requests.get(url, headers=headers)
+                response = HTTP_SESSION.get(url, headers=headers)
             response.raise_for_status()
             content = self.convert_to_utf8_if_sjis(response.content)
-            return json.loads(content)
+            return json_loads(content)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching data from {url}: {e}")
             exit_with_error(f"データの取得に失敗しました: {url}")
@@ -872,7 +903,7 @@ class KintoneApp:
         url = f"https://{self.subdomain}.cybozu.com/k/v1/file.json?fileKey={file_key}"
         headers = {"X-Cybozu-API-Token": self.api_token}
         try:
-            response = requests.get(url, headers=headers, stream=True, allow_redirects=True)
+            response = HTTP_SESSION.get(url, headers=headers, stream=True, allow_redirects=True)
             response.raise_for_status()
             safe_filename = file_name
             file_path = self.js_dir / safe_filename
@@ -914,10 +945,10 @@ class KintoneApp:
         encoded_auth = base64.b64encode(auth_string.encode()).decode()
         headers = {"X-Cybozu-Authorization": encoded_auth}
         try:
-            response = requests.get(url, headers=headers)
+            response = HTTP_SESSION.get(url, headers=headers)
             response.raise_for_status()
             content = self.convert_to_utf8_if_sjis(response.content)
-            return json.loads(content)
+            return json_loads(content)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching customize info: {e}")
             return {"desktop": {"js": []}}
@@ -1351,7 +1382,7 @@ class KintoneApp:
             return
 
         with open(settings_file, 'r', encoding='utf-8') as f:
-            settings_data = json.load(f)
+            settings_data = json_loads(f.read())
 
         # 新しいシートを作成
         ws = workbook.create_sheet(title="アプリ設定")
@@ -1440,7 +1471,7 @@ class KintoneApp:
         while True:
             params = {"app": self.appid, "query": f"limit {limit} offset {offset}"}
             try:
-                response = requests.get(url, headers=headers, params=params)
+                response = HTTP_SESSION.get(url, headers=headers, params=params)
                 response.raise_for_status()
                 data = response.json()
                 records = data.get("records", [])
@@ -1530,20 +1561,24 @@ class KintoneApp:
         self.export_all_records()
 
 # ─── エントリーポイント ─────────────────────────────────────────────
-if __name__ == "__main__":
-    if len(sys.argv) == 2:
-        appid = sys.argv[1]
+def main(argv=None):
+    """
+    コマンドライン引数（argv を省略した場合は sys.argv[1:]）に従ってアプリ情報を取得する
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if len(argv) == 1:
+        appid = argv[0]
         app = KintoneApp(appid)
         app.run()
-    elif len(sys.argv) == 6:
-        appid = sys.argv[1]
-        api_token = sys.argv[2]
-        subdomain = sys.argv[3]
-        username = sys.argv[4]
-        password = sys.argv[5]
+    elif len(argv) == 5:
+        appid, api_token, subdomain, username, password = argv
         app = KintoneApp(appid, api_token, subdomain, username, password)
         app.run()
     else:
         print("Usage: python script.py <appid> [<api_token> <subdomain> <username> <password>]")
         print("Note: 認証情報は config_UserAccount.yaml からも読み込めます")
         exit_with_error("引数が不正です")
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,8 @@ from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
 from dotenv import load_dotenv
 
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # 定数定義
 SCRIPT_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = SCRIPT_DIR.parent / "output"
@@ -46,7 +48,7 @@ def load_yaml_file(file_path):
     """YAMLファイルを読み込む"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YAML_LOADER)
     except Exception as e:
         raise Exception(f"YAMLファイルの読み込みに失敗しました: {file_path} - {e}")
 
@@ -81,7 +83,7 @@ def load_group_yaml_data(yaml_path):
             return {}
             
         with open(yaml_path, 'r', encoding='utf-8') as f:
-            group_data = yaml.safe_load(f)
+            group_data = yaml.load(f, Loader=YAML_LOADER)
             logging.info(f"group_user_list.yaml から {len(group_data)} 件のグループ情報を読み込みました。")
             return group_data
     except Exception as e:
@@ -100,7 +102,7 @@ def load_group_list_yaml(yaml_dir):
             return {}
             
         with open(group_list_path, 'r', encoding='utf-8') as f:
-            group_mapping = yaml.safe_load(f)
+            group_mapping = yaml.load(f, Loader=YAML_LOADER)
             return group_mapping
     except Exception as e:
         logging.warning(f"グループリストの読み込みに失敗しました: {e}")
@@ -118,7 +120,7 @@ def load_user_list_yaml(yaml_dir):
             return {}
             
         with open(user_list_path, 'r', encoding='utf-8') as f:
-            user_data = yaml.safe_load(f)
+            user_data = yaml.load(f, Loader=YAML_LOADER)
             return user_data
     except Exception as e:
         logging.warning(f"ユーザーリストの読み込みに失敗しました: {e}")
@@ -1282,14 +1284,14 @@ def set_font_to_arial(wb):
                     # フォント設定がない場合は新規作成
                     cell.font = Font(name='Arial')
 
-def main():
-    """メイン関数"""
+def main(argv=None):
+    """メイン関数（argv を省略した場合は sys.argv[1:] を解析）"""
     # コマンドライン引数の解析
     parser = argparse.ArgumentParser(description='kintoneアプリの通知設定をExcelに出力するスクリプト')
     parser.add_argument('app_id', type=int, help='アプリID')
     parser.add_argument('--output', type=str, help='出力ファイル名')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # ロギングの設定
     logger = setup_logging()
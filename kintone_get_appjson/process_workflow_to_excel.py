@@ -16,6 +16,11 @@ from datetime import datetime
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, PatternFill, Border, Side, Font
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 定数定義
 SCRIPT_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = SCRIPT_DIR.parent / "output"
@@ -466,8 +471,8 @@ def set_font_to_arial(wb):
                     # フォント設定がない場合は新規作成
                     cell.font = Font(name='Arial')
 
-def main():
-    """メイン関数"""
+def main(argv=None):
+    """メイン関数（argv を省略した場合は sys.argv[1:] を解析）"""
     # コマンドライン引数の解析
     parser = argparse.ArgumentParser(description='kintoneアプリのプロセス管理ワークフローをExcelに出力するスクリプト')
     parser.add_argument('app_id', help='アプリID')
@@ -476,7 +481,7 @@ def main():
     parser.add_argument('username', help='ユーザー名', nargs='?')
     parser.add_argument('password', help='パスワード', nargs='?')
     parser.add_argument('--output', help='出力ファイル名（省略時は自動生成）')
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # ロギングの設定
     logger = setup_logging()
@@ -556,7 +561,7 @@ def main():
     # JSONファイルを読み込む
     try:
         with open(process_file, 'r', encoding='utf-8') as f:
-            process_data = json.load(f)
+            process_data = orjson.loads(f.read()) if orjson is not None else json.load(f)
     except Exception as e:
         logger.error(f"プロセス管理ファイルの読み込み中にエラーが発生しました: {e}")
         sys.exit(1)
@@ -1,10 +1,17 @@
 import argparse
 import sys
 import base64
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from getpass import getpass
+from pathlib import Path
 from typing import List, Dict, Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import pandas as pd
 from openpyxl import load_workbook
@@ -19,26 +26,48 @@ import os
 import random
 import colorsys
 
+# --cache-ttl 指定時にAPIの取得結果を保存するディレクトリ
+CACHE_DIR = Path(__file__).resolve().parent / '.cache'
+# グループごとの所属ユーザーを並列に取得するスレッド数（HTTPの接続プールの大きさも揃える）
+MAX_FETCH_WORKERS = 16
+
 class ArgumentParser:
   @staticmethod
-  def parse_arguments():
+  def parse_arguments(argv=None):
     parser = argparse.ArgumentParser(
       description='Kintoneの全ユーザーと各ユーザーの所属グループをExcelに出力します。\n\n引数を省略した場合、config_UserAccount.yaml を参照して認証情報を取得し、デフォルトの出力ファイル名を使用します。',
       formatter_class=argparse.RawTextHelpFormatter
     )
     parser.add_argument('--subdomain', help='Kintoneのサブドメイン (例: sample)')
     parser.add_argument('--username', help='管理者ユーザーのログイン名 (例: user@example.com)')
-    parser.add_argument('--password', help='管理者ユーザーのパスワード (指定しない場合、プロンプトで入力)')
+    parser.add_argument('--password', help='管理者ユーザーのパスワード (指定しない場合、環境変数 KINTONE_PASSWORD を使用)')
     parser.add_argument('--output', default='kintone_users_groups.xlsx', help='出力するExcelファイルの名前 (デフォルト: kintone_users_groups.xlsx)')
     parser.add_argument('--silent', action='store_true', help='サイレントモードを有効にします。詳細なログを表示しません。')
+    parser.add_argument('--cache-ttl', type=int, default=0, help='ユーザー・グループの取得結果をディスクにキャッシュする秒数 (デフォルト: 0 = キャッシュしない)')
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 class KintoneClient:
-  def __init__(self, subdomain: str, username: str, password: str, logger: logging.Logger):
+  def __init__(self, subdomain: str, username: str, password: str, logger: logging.Logger, cache_ttl: int = 0):
     self.subdomain = subdomain
+    self.username = username
     self.headers = self._get_auth_header(username, password)
     self.logger = logger
+    # 同じ実行中の同じ取得（グループの所属ユーザーなど）は2回目以降メモリから返す
+    self._memo: Dict[str, List[Dict[str, Any]]] = {}
+    # 0より大きい場合は取得結果を CACHE_DIR に保存し、期限内であれば次回の実行でも再利用する
+    self.cache_ttl = cache_ttl
+    # グループごとの取得でも接続を使い回すため、セッションを保持する
+    self.session = self._create_session()
+    self.session.headers.update(self.headers)
+
+  @staticmethod
+  def _create_session() -> requests.Session:
+    # 429/5xx は間隔を空けて再試行し、最終的な応答は従来どおりステータスコードで判定する
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+    session.mount('https://', HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS, max_retries=retry))
+    return session
 
   @staticmethod
   def _get_auth_header(username: str, password: str) -> Dict[str, str]:
@@ -49,6 +78,43 @@ class KintoneClient:
     }
 
   def _fetch_data(self, endpoint: str, params: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    # 取得できる範囲はユーザーの権限で異なるため、別のユーザーの取得結果は再利用しない
+    cache_key = hashlib.blake2b(
+      json.dumps([self.subdomain, self.username, endpoint, params], sort_keys=True).encode('utf-8'), digest_size=16
+    ).hexdigest()
+    data = self._memo.get(cache_key)
+    if data is not None:
+      return data
+
+    cache_file = CACHE_DIR / f"{cache_key}.json"
+    if self.cache_ttl > 0:
+      try:
+        if time.time() - cache_file.stat().st_mtime < self.cache_ttl:
+          with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+          self.logger.debug(f"{endpoint}をキャッシュから読み込みました: {cache_file}")
+      except (OSError, ValueError):
+        data = None
+
+    if data is None:
+      data = self._fetch_all_pages(endpoint, params, key)
+      if self.cache_ttl > 0:
+        try:
+          # ユーザー名やメールアドレスを含むため、本人以外が読めないようにして保存する
+          CACHE_DIR.mkdir(mode=0o700, exist_ok=True)
+          os.chmod(CACHE_DIR, 0o700)
+          tmp_file = cache_file.with_suffix('.tmp')
+          fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+          with open(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+          os.replace(tmp_file, cache_file)
+        except OSError as e:
+          self.logger.warning(f"{endpoint}のキャッシュを保存できませんでした: {e}")
+
+    self._memo[cache_key] = data
+    return data
+
+  def _fetch_all_pages(self, endpoint: str, params: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
     url = f"https://{self.subdomain}.cybozu.com/v1/{endpoint}.json"
     data = []
     size = 100
@@ -57,7 +123,7 @@ class KintoneClient:
     while True:
       current_params = params.copy()
       current_params.update({'size': size, 'offset': offset})
-      response = requests.get(url, headers=self.headers, params=current_params)
+      response = self.session.get(url, params=current_params)
       if response.status_code != 200:
         self.logger.error(f"{endpoint.capitalize()}の取得に失敗しました: {response.status_code} {response.text}")
         sys.exit(1)
@@ -125,11 +191,18 @@ class DataProcessor:
 
   def populate_group_memberships(self, filtered_groups: List[Dict[str, Any]]):
     self.logger.info("各グループの所属ユーザーを取得中...")
-    for group in filtered_groups:
+    # グループごとの取得は互いに独立しているため並列に行い、反映はグループの順序どおりに行う
+    # （取得結果はクライアントが保持するため、export_group_user_list では再取得しない）
+    group_codes = [group.get('code') for group in filtered_groups]
+    if group_codes:
+      with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(group_codes))) as executor:
+        group_users = list(executor.map(self.client.get_users_in_group, group_codes))
+    else:
+      group_users = []
+    for group, users_in_group in zip(filtered_groups, group_users):
       group_code = group.get('code')
       group_name = group.get('name')
-      self.logger.info(f"グループ '{group_name}' ({group_code}) のユーザーを取得中...")
-      users_in_group = self.client.get_users_in_group(group_code)
+      self.logger.info(f"グループ '{group_name}' ({group_code}) のユーザーを取得しました")
       self.logger.info(f"グループ '{group_name}' に所属するユーザー数: {len(users_in_group)}")
       for user in users_in_group:
         user_id = str(user.get('id'))
@@ -880,8 +953,8 @@ def load_config(config_path: str) -> Dict[str, Any]:
     with open(config_path, 'r', encoding='utf-8') as file:
         return yaml.safe_load(file)
 
-def main():
-  args = ArgumentParser.parse_arguments()
+def main(argv=None):
+  args = ArgumentParser.parse_arguments(argv)
   logger = setup_logging(args.silent, False)
 
   # auditディレクトリの作成（カレントディレクトリ直下）
@@ -890,7 +963,7 @@ def main():
   # 認証情報の初期化
   subdomain = args.subdomain
   username = args.username
-  password = args.password
+  password = args.password or os.environ.get('KINTONE_PASSWORD')
 
   # 引数が指定されていない場合、デフォルトのconfig_UserAccount.yamlを使用
   if not (subdomain and username and password):
@@ -910,7 +983,7 @@ def main():
 
   # Kintoneクライアントの初期化
   logger.info("認証情報を設定中...")
-  client = KintoneClient(subdomain, username, password, logger)
+  client = KintoneClient(subdomain, username, password, logger, cache_ttl=args.cache_ttl)
 
   # データの取得
   logger.info("全ユーザーを取得中...")
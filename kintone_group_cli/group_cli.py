@@ -12,6 +12,8 @@ class KintoneClient:
         self.headers = self._get_auth_header(username, password)
         self.logger = logger
         self.base_url = f"https://{subdomain}.cybozu.com"
+        # 複数のAPI呼び出しで接続を使い回すため、セッションを保持する
+        self.session = requests.Session()
 
     @staticmethod
     def _get_auth_header(username: str, password: str) -> dict:
@@ -23,7 +25,7 @@ class KintoneClient:
 
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
         try:
-            response = requests.request(method, url, headers=self.headers, **kwargs)
+            response = self.session.request(method, url, headers=self.headers, **kwargs)
             if response.status_code != 200:
                 self.logger.error("=== エラーレスポンス ===")
                 self.logger.error(f"ステータスコード: {response.status_code}")
@@ -348,7 +350,7 @@ def load_config(config_path: str = 'config_UserAccount.yaml') -> dict:
         print(f"設定ファイルの読み込みに失敗しました: {e}")
         sys.exit(1)
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description='kintoneグループ管理ツール',
         formatter_class=argparse.RawTextHelpFormatter
@@ -361,7 +363,7 @@ def main():
     parser.add_argument('--debug', action='store_true', help='デバッグログを表示する')
     parser.add_argument('--search', action='store_true', help='ユーザー検索モードを有効にする')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
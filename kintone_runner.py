@@ -10,12 +10,26 @@ kintone_get_user_group、kintone_get_appjson、kintone_group_cliの
 """
 
 import os
+import io
 import sys
-import yaml
+import atexit
+import copy
+import errno
 import argparse
+import contextlib
+import importlib.util
 import subprocess
 import logging
+import logging.handlers
+import multiprocessing
+import queue
 import re
+import shutil
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
@@ -28,6 +42,52 @@ ENV_FILE = SCRIPT_DIR / ".kintone.env"
 CONFIG_FILE = SCRIPT_DIR / "config_UserAccount.yaml"
 ERROR_REPORT_FILE = SCRIPT_DIR / "error_report.txt"
 
+# 引数でロガーを受け取らない関数が使用するロガー（setup_logging が返すものと同じ）
+logger = logging.getLogger("kintone_runner")
+
+# アプリ単位の並列実行時の既定ワーカー数の上限
+DEFAULT_MAX_WORKERS = 8
+
+# エラーレポートの書き込みキューと書き込みスレッド（_get_error_queue で初回のみ起動する）
+_error_queue = None
+_error_thread = None
+_error_queue_lock = threading.Lock()
+# 書き込みスレッドのバッファサイズ（キューが空になった時点でまとめてフラッシュする）
+ERROR_REPORT_BUFFER_SIZE = 1 << 16
+
+# True の場合は各スクリプトを従来どおり子プロセスで実行する（--isolate）
+ISOLATE_SCRIPTS = False
+
+# 子プロセス実行時にエラーレポート用として保持する標準エラー出力の末尾行数
+STDERR_TAIL_LINES = 500
+# 同一プロセス実行時にエラーレポート用として保持する標準出力・標準エラー出力の末尾（書き込み回数）
+OUTPUT_TAIL_WRITES = 1000
+
+# モジュールとして読み込んだスクリプトのキャッシュ（キー: スクリプトのパス）
+_script_modules = {}
+_script_modules_lock = threading.Lock()
+
+# ログやエラーレポートに出力しない機密情報（パスワード・APIトークン。load_env_config で登録）
+_masked_values = set()
+# _masked_values のいずれかに一致する正規表現（_register_masked_values で再構築する）
+_masked_pattern = None
+
+# 前回の出力を削除するまで一時的に置くディレクトリ名の接頭辞（SCRIPT_DIR 直下に .trash_<プロセスID> として作成）
+TRASH_DIR_PREFIX = ".trash_"
+# Windows でプロセスの実行状態を確認する際に使用する値（OpenProcess のアクセス権・エラーコード・終了コード）
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_ACCESS_DENIED = 5
+STILL_ACTIVE = 259
+
+# Windowsの共有違反をExcelで開かれていることによるものとみなすファイルの拡張子
+EXCEL_SUFFIXES = ('.xlsx', '.xlsm', '.xls')
+
+# 実行単位のタイムスタンプ（ログ・出力ファイル・バックアップ名で共通に使用）
+RUN_TIMESTAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+# 出力ファイル名・ディレクトリ名に付与される日時部分（_YYYYMMDD_HHMMSS）のパターン
+DATETIME_SUFFIX_PATTERN = re.compile(r'_\d{8}_\d{6}')
+
 # 各ディレクトリのパス
 USER_GROUP_DIR = SCRIPT_DIR / "kintone_get_user_group"
 APPJSON_DIR = SCRIPT_DIR / "kintone_get_appjson"
@@ -86,26 +146,101 @@ OUTPUT_FILE_INFO = {
 }
 
 # ログ設定
-def setup_logging():
-    """ロギングの設定"""
+def setup_logging(timestamp=None):
+    """
+    ロギングの設定
+    
+    Args:
+        timestamp (str, optional): ログファイル名に付与する日時（省略時は RUN_TIMESTAMP）
+    """
     log_dir = SCRIPT_DIR / "logs"
-    log_dir.mkdir(exist_ok=True)
+    _ensure_dir(log_dir)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = timestamp or RUN_TIMESTAMP
     log_file = log_dir / f"kintone_runner_{timestamp}.log"
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    # ログファイルへの書き込みは別スレッドでまとめて行い、呼び出し元をディスクI/Oで待たせない。
+    # ERROR 以上のレコードはバッファを待たずに即座に書き出す
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(formatter)
+    buffered_file_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler
+    )
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, buffered_file_handler, respect_handler_level=True)
+    listener.start()
+    # 終了時にキューに残ったレコードを書き出す（バッファは logging.shutdown で書き出される）
+    atexit.register(listener.stop)
+    
+    # コンソール出力は print との順序を保つため同期的に行う
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
     
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+        handlers=[queue_handler, stream_handler]
     )
     
-    return logging.getLogger("kintone_runner")
+    return logger
+
+# 出力用ディレクトリの作成
+@lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """
+    ディレクトリが存在しない場合のみ作成する（同じパスについてはプロセス内で1回のみ確認する）
+    
+    既存ディレクトリに対する mkdir(exist_ok=True) は mkdir の失敗と stat の2回のシステムコールになるため、
+    先に is_dir で確認する。
+    
+    Args:
+        path (Path): 作成するディレクトリのパス
+    """
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+
+@lru_cache(maxsize=None)
+def _ensure_dirs_once():
+    """
+    OUTPUT_DIR / PREVIOUS_OUTPUT_DIR / BACKUP_DIR を作成する（プロセス内で1回のみ実行）
+
+    main() がファイルを出力するサブコマンド（OUTPUT_COMMANDS）の実行前に必ず呼び出すため、
+    各処理関数はこれらのディレクトリが存在する前提で動作し、個別に mkdir を発行しない。
+    """
+    for directory in [OUTPUT_DIR, PREVIOUS_OUTPUT_DIR, BACKUP_DIR]:
+        _ensure_dir(directory)
+
+@lru_cache(maxsize=None)
+def _yaml_codec():
+    """
+    yaml を初回使用時に読み込み、(yaml, ローダー, ダンパー) を返す
+    
+    ヘルプや outputs の表示など、設定ファイルを読まない実行では
+    PyYAML の読み込み自体を省く。libyaml が利用可能な場合はC実装のローダー/ダンパーを使用する。
+    """
+    import yaml
+    try:
+        from yaml import CSafeLoader as loader, CSafeDumper as dumper
+    except ImportError:
+        from yaml import SafeLoader as loader, SafeDumper as dumper
+    return yaml, loader, dumper
 
 # 設定ファイルの読み込み
+@lru_cache(maxsize=8)
+def _load_env_cached(env_file, mtime_ns, size):
+    """
+    .kintone.env を解析した結果を返す（パス・更新時刻・サイズをキーにプロセス内でキャッシュ）
+
+    パスワードやAPIトークンを平文で別ファイルに残さないため、解析結果はディスクには書き出さない。
+    """
+    # 小さなファイルを一括で読むため、ファイルオブジェクトを介さずに読み込む
+    content = env_file.read_text(encoding='utf-8')
+    yaml, loader, _ = _yaml_codec()
+    return yaml.load(content, Loader=loader)
+
 def load_env_config(env_file=None):
     """
     .kintone.env ファイルを読み込み、設定情報を返す
@@ -113,14 +248,16 @@ def load_env_config(env_file=None):
     if env_file is None:
         env_file = ENV_FILE
     
-    if not env_file.exists():
+    # 存在確認とキャッシュキー（更新時刻・サイズ）の取得を1回の stat で行う
+    try:
+        st = env_file.stat()
+    except FileNotFoundError:
         print(f"エラー: 設定ファイル {env_file} が見つかりません。")
         sys.exit(1)
     
     try:
-        with open(env_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            config = yaml.safe_load(content)
+        # キャッシュした辞書を呼び出し元が変更しても影響しないようにコピーを返す
+        config = copy.deepcopy(_load_env_cached(env_file, st.st_mtime_ns, st.st_size))
             
         # 必須項目をチェック
         required_keys = ['subdomain', 'username', 'password']
@@ -133,6 +270,13 @@ def load_env_config(env_file=None):
         # app_tokens が辞書形式でない場合の処理
         if 'app_tokens' in config and config['app_tokens'] is None:
             config['app_tokens'] = {}
+        
+        # YAML ではアプリIDが数値キーにも文字列キーにもなり得るため、文字列キーに揃える
+        if 'app_tokens' in config:
+            config['app_tokens'] = {str(k): v for k, v in config['app_tokens'].items()}
+        
+        # パスワードとAPIトークンはログ出力時に伏せ字にする
+        _register_masked_values([config['password'], *config.get('app_tokens', {}).values()])
             
         return config
     except Exception as e:
@@ -146,39 +290,346 @@ def create_config_file(config, config_path=None):
     """
     if config_path is None:
         config_path = CONFIG_FILE
-    
+
+    # 一時ファイルに書き出してから置き換え、読み手が書きかけのYAMLを読まないようにする
+    tmp_path = config_path.with_suffix(config_path.suffix + '.tmp')
     try:
-        with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        yaml, _, dumper = _yaml_codec()
+        data = yaml.dump(config, Dumper=dumper, default_flow_style=False).encode('utf-8')
+        
+        with open(tmp_path, 'wb', buffering=65536) as f:
+            f.write(data)
+        os.replace(tmp_path, config_path)
         return True
     except Exception as e:
         print(f"エラー: config_UserAccount.yaml の作成中にエラーが発生しました: {e}")
+        if tmp_path.exists():
+            tmp_path.unlink()
         return False
 
 # 出力ファイル情報の表示
-def display_output_info():
+@lru_cache(maxsize=None)
+def _render_output_info():
     """
-    生成されるExcel、CSV、TSVファイルの情報を表示
+    display_output_info で表示する文字列を組み立てる（OUTPUT_FILE_INFO は定数のため1回のみ）
+    
+    Returns:
+        str: 表示するファイル一覧
     """
-    print("=== Kintone Runner が生成するファイル一覧 ===")
-    print("※ JSON、YAMLファイルは除く\n")
+    lines = [
+        "=== Kintone Runner が生成するファイル一覧 ===",
+        "※ JSON、YAMLファイルは除く\n",
+    ]
     
     for file_type, files in OUTPUT_FILE_INFO.items():
-        print(f"【{file_type.upper()}ファイル】")
+        lines.append(f"【{file_type.upper()}ファイル】")
         for file_info in files:
+            lines.append(f"■ {file_info['name']}")
             if file_info["name"] and file_info["command"]:
-                print(f"■ {file_info['name']}")
-                print(f"  内容: {file_info['description']}")
-                print(f"  コマンド: {file_info['command']} {file_info['args']}")
-                print()
-            else:
-                print(f"■ {file_info['name']}")
-                print()
+                lines.append(f"  内容: {file_info['description']}")
+                lines.append(f"  コマンド: {file_info['command']} {file_info['args']}")
+            lines.append("")
+    
+    lines.append("※ すべてのファイルは 'all' コマンドでも一括生成できます。")
+    lines.append("※ 出力先ディレクトリ: ./output/")
+    return "\n".join(lines) + "\n"
+
+def display_output_info():
+    """
+    生成されるExcel、CSV、TSVファイルの情報を表示
+    """
+    # 組み立て済みの文字列を1回の書き込みで出力する
+    sys.stdout.write(_render_output_info())
+
+# スクリプトの実行
+def _load_script_module(script_path):
+    """
+    スクリプトをモジュールとして読み込む（読み込み済みの場合はキャッシュを返す）
+
+    kintone_get_appjson とルートに同名のスクリプトがあるため、
+    モジュール名ではなくファイルパスから読み込む。
+    """
+    key = str(script_path)
+    with _script_modules_lock:
+        module = _script_modules.get(key)
+        if module is None:
+            module_name = f"_kintone_runner_{script_path.parent.name}_{script_path.stem}"
+            spec = importlib.util.spec_from_file_location(module_name, script_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _script_modules[key] = module
+    return module
+
+class _TailWriter(io.TextIOBase):
+    """
+    書き込まれた文字列を元のストリームにそのまま流しつつ、末尾のみを保持するストリーム
+
+    同一プロセス実行時にも、子プロセス実行時と同様にスクリプトの出力をエラーレポートに含めるために使用する。
+    """
+    def __init__(self, stream, maxlen=OUTPUT_TAIL_WRITES):
+        self._stream = stream
+        self._tail = deque(maxlen=maxlen)
+
+    @property
+    def encoding(self):
+        return getattr(self._stream, 'encoding', 'utf-8')
+
+    def isatty(self):
+        return self._stream.isatty()
+
+    def write(self, s):
+        self._stream.write(s)
+        self._tail.append(s)
+        return len(s)
+
+    def flush(self):
+        self._stream.flush()
+
+    def getvalue(self):
+        return ''.join(self._tail)
+
+@contextlib.contextmanager
+def _script_process_state():
+    """
+    スクリプトを同一プロセス内で実行する間だけ、子プロセスで実行した場合と同じ状態を用意する
+
+    スクリプト側の logging.basicConfig（ログファイルや書式の設定）が有効になるように
+    ルートロガーのハンドラーを一時的に外し、終了後にスクリプトが追加したハンドラーを閉じて元に戻す。
+    load_dotenv などによる環境変数の変更も終了後に元に戻す。
+    """
+    root = logging.getLogger()
+    saved_handlers = root.handlers[:]
+    saved_level = root.level
+    saved_environ = os.environ.copy()
+    for handler in saved_handlers:
+        root.removeHandler(handler)
+    try:
+        yield
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+        for key in os.environ.keys() - saved_environ.keys():
+            del os.environ[key]
+        for key, value in saved_environ.items():
+            if os.environ.get(key) != value:
+                os.environ[key] = value
+
+def _register_masked_values(values):
+    """
+    ログやエラーレポートで伏せ字にする値を登録し、一括置換用の正規表現を作り直す
+    
+    Args:
+        values (iterable): 伏せ字にする値（空の値は無視する）
+    """
+    global _masked_pattern
+    _masked_values.update(str(value) for value in values if value)
+    if _masked_values:
+        # 長い値を先に試し、ある値が別の値の一部でも完全に伏せ字にする
+        alternatives = sorted(_masked_values, key=len, reverse=True)
+        _masked_pattern = re.compile('|'.join(map(re.escape, alternatives)))
+
+def _mask_cmd(cmd):
+    """
+    コマンドをログ出力用の文字列にする（パスワードやAPIトークンは伏せ字にする）
+    
+    Args:
+        cmd (list or str): 実行するコマンド
+    
+    Returns:
+        str: 機密情報を伏せ字にしたコマンド文字列
+    """
+    if isinstance(cmd, (list, tuple)):
+        return ' '.join('********' if str(arg) in _masked_values else str(arg) for arg in cmd)
+    if _masked_pattern is None:
+        return str(cmd)
+    # 文字列全体を1回走査してすべての機密情報を置き換える
+    return _masked_pattern.sub('********', str(cmd))
+
+def _run_script(cmd, capture_stdout=False, env=None):
+    """
+    Python スクリプトを実行する（subprocess.run(cmd, check=True, ...) 相当）
+
+    通常はスクリプトをモジュールとして読み込み、main(argv) を同一プロセス内で呼び出して
+    インタプリタの起動と依存ライブラリの再インポートを省く。実行中のロガーと環境変数は
+    _script_process_state でスクリプト専用に切り替え、標準出力・標準エラー出力の末尾はエラーレポート用に保持する。
+    これらはプロセス全体の状態のため、同一プロセス内で実行するのはメインスレッドから呼ばれた場合
+    （他の処理と並行していない場合）に限る。ISOLATE_SCRIPTS が True の場合や、並行実行中のスレッドから
+    呼ばれた場合は従来どおり子プロセスで実行する。
+
+    Args:
+        cmd (list): [sys.executable, スクリプトのパス, 引数...]
+        capture_stdout (bool): 標準出力を取り込んで結果に含めるか。False の場合は画面にそのまま出力する
+        env (dict, optional): スクリプトの実行中のみ追加する環境変数（ランナー自身の os.environ は変更しない）
+
+    Returns:
+        CompletedProcess: 実行結果
+
+    Raises:
+        subprocess.CalledProcessError: スクリプトが異常終了した場合（cmd は機密情報を伏せ字にした文字列）
+    """
+    if ISOLATE_SCRIPTS or threading.current_thread() is not threading.main_thread():
+        child_env = {**os.environ, **env} if env else None
+        if capture_stdout:
+            try:
+                return subprocess.run(cmd, check=True, capture_output=True, text=True, env=child_env)
+            except subprocess.CalledProcessError as e:
+                e.cmd = _mask_cmd(e.cmd)
+                raise
+        
+        # 標準出力は親プロセスの出力をそのまま継承させ、Python 側でバッファリングしない。
+        # 標準エラー出力は画面に流しつつ、エラーレポート用に末尾のみ保持する
+        stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+        with subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True, env=child_env) as proc:
+            for line in proc.stderr:
+                sys.stderr.write(line)
+                stderr_tail.append(line)
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, _mask_cmd(cmd), output="", stderr="".join(stderr_tail))
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+    
+    script_path = Path(cmd[1])
+    argv = [str(arg) for arg in cmd[2:]]
+    stdout = io.StringIO() if capture_stdout else _TailWriter(sys.stdout)
+    stderr_writer = _TailWriter(sys.stderr)
+    returncode = 0
+    stderr = ""
+    try:
+        with _script_process_state(), \
+                contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr_writer):
+            # 追加の環境変数は _script_process_state の終了時に元に戻る
+            os.environ.update(env or {})
+            module = _load_script_module(script_path)
+            rc = module.main(argv)
+            # 0 以外の戻り値は sys.exit(main()) で実行した場合と同じく終了コードとして扱う
+            if rc not in (None, 0):
+                raise SystemExit(rc)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            returncode = e.code if isinstance(e.code, int) else 1
+            stderr = traceback.format_exc()
+    except Exception:
+        returncode = 1
+        stderr = traceback.format_exc()
+    
+    if returncode != 0:
+        raise subprocess.CalledProcessError(
+            returncode, _mask_cmd(cmd), output=stdout.getvalue(), stderr=stderr_writer.getvalue() + stderr
+        )
+    # 画面に出力済みの内容は子プロセス実行時と同様に結果には含めない
+    output = stdout.getvalue() if capture_stdout else ""
+    return subprocess.CompletedProcess(cmd, 0, stdout=output, stderr="")
+
+def _render_worker(cmd):
+    """
+    ProcessPoolExecutor のワーカープロセスでスクリプトを実行する
+    
+    CalledProcessError は pickle で標準出力・標準エラー出力が失われるため、
+    結果を (終了コード, 標準出力, 標準エラー出力) のタプルで親プロセスに返す。
+    
+    Args:
+        cmd (list): [sys.executable, スクリプトのパス, 引数...]
+    
+    Returns:
+        tuple: (終了コード, 標準出力, 標準エラー出力)
+    """
+    try:
+        result = _run_script(cmd)
+        return 0, result.stdout, result.stderr
+    except subprocess.CalledProcessError as e:
+        return e.returncode, e.output, e.stderr
+
+def _create_script_pool(max_workers, count):
+    """
+    アプリごとのスクリプト実行に使うプロセスプールを作成する
+    
+    Excelの描画やHTMLの解析はCPU処理が中心でスレッドでは並列化されないため、
+    複数アプリを同一プロセス内で実行する場合はワーカープロセスに任せる。
+    --isolate 指定時は元々子プロセスで実行されるため作成しない。
+    
+    Args:
+        max_workers (int): 呼び出し元の並列実行数
+        count (int): 処理するアプリ数
+    
+    Returns:
+        ProcessPoolExecutor: 作成したプロセスプール。不要な場合は None
+    """
+    if ISOLATE_SCRIPTS or count <= 1:
+        return None
+    # ログ出力のスレッドなどが動作中のため fork ではなく spawn でワーカーを起動する
+    return ProcessPoolExecutor(
+        max_workers=min(max_workers, os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+def _run_script_in_pool(pool, cmd):
+    """
+    _run_script と同じ結果・例外でスクリプトをワーカープロセス上で実行する
+    
+    Args:
+        pool (ProcessPoolExecutor): 実行に使用するプロセスプール
+        cmd (list): [sys.executable, スクリプトのパス, 引数...]
     
-    print("※ すべてのファイルは 'all' コマンドでも一括生成できます。")
-    print("※ 出力先ディレクトリ: ./output/")
+    Returns:
+        CompletedProcess: 実行結果
+    
+    Raises:
+        subprocess.CalledProcessError: スクリプトが異常終了した場合
+    """
+    returncode, stdout, stderr = pool.submit(_render_worker, cmd).result()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, _mask_cmd(cmd), output=stdout, stderr=stderr)
+    return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr=stderr)
 
 # エラー情報をファイルに記録する関数
+def _drain_error_reports(error_queue):
+    """
+    キューに積まれたエラーレポートを error_report.txt に書き込む（書き込みスレッド本体）
+    
+    ファイルは一度だけ開き、キューが空になった時点でフラッシュする。
+    None を受け取ると残りを書き出して終了する。
+    
+    Args:
+        error_queue (queue.Queue): エラーレポート文字列のキュー
+    """
+    with open(ERROR_REPORT_FILE, 'a', encoding='utf-8', buffering=ERROR_REPORT_BUFFER_SIZE) as f:
+        while True:
+            report = error_queue.get()
+            if report is None:
+                break
+            f.write(report)
+            if error_queue.empty():
+                f.flush()
+
+def _stop_error_writer():
+    """エラーレポートの書き込みスレッドを停止し、未書き込みのレポートを書き出す"""
+    _error_queue.put(None)
+    _error_thread.join()
+
+def _get_error_queue():
+    """
+    エラーレポートの書き込みキューを返す（初回呼び出し時に書き込みスレッドを起動し、終了時の停止を登録する）
+    
+    Returns:
+        queue.Queue: エラーレポート文字列のキュー
+    """
+    global _error_queue, _error_thread
+    with _error_queue_lock:
+        if _error_queue is None:
+            _error_queue = queue.Queue()
+            _error_thread = threading.Thread(
+                target=_drain_error_reports,
+                args=(_error_queue,),
+                name="error-report-writer",
+                daemon=True
+            )
+            _error_thread.start()
+            atexit.register(_stop_error_writer)
+    return _error_queue
+
 def log_error_to_file(logger, error, command=None, stdout=None, stderr=None, context=None):
     """
     エラー情報をerror_report.txtファイルに追記する
@@ -194,44 +645,48 @@ def log_error_to_file(logger, error, command=None, stdout=None, stderr=None, con
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     try:
-        with open(ERROR_REPORT_FILE, 'a', encoding='utf-8') as f:
-            f.write(f"===== エラーレポート: {timestamp} =====\n")
+        parts = [f"===== エラーレポート: {timestamp} =====\n"]
+        
+        if context:
+            parts.append(f"処理内容: {context}\n")
+            
+        if command:
+            # パスワードなどの機密情報をマスク
+            parts.append(f"実行コマンド: {_mask_cmd(command)}\n")
             
-            if context:
-                f.write(f"処理内容: {context}\n")
-                
-            if command:
-                # パスワードなどの機密情報をマスク
-                masked_command = command
-                if isinstance(command, list):
-                    masked_command = ' '.join(command)
-                masked_command = masked_command.replace('"password"', '"********"').replace("password", "********")
-                f.write(f"実行コマンド: {masked_command}\n")
-                
-            f.write(f"エラータイプ: {type(error).__name__}\n")
-            f.write(f"エラーメッセージ: {str(error)}\n")
+        parts.append(f"エラータイプ: {type(error).__name__}\n")
+        parts.append(f"エラーメッセージ: {_mask_cmd(str(error))}\n")
+        
+        # トレースバック情報を追加
+        tb_str = traceback.format_exc()
+        parts.append(f"\n--- トレースバック ---\n{tb_str}\n")
+        
+        if stdout:
+            parts.append(f"\n--- 標準出力 ---\n{stdout}\n")
             
-            # トレースバック情報を追加
-            import traceback
-            tb_str = traceback.format_exc()
-            f.write(f"\n--- トレースバック ---\n{tb_str}\n")
+        if stderr:
+            parts.append(f"\n--- 標準エラー出力 ---\n{stderr}\n")
             
-            if stdout:
-                f.write(f"\n--- 標準出力 ---\n{stdout}\n")
-                
-            if stderr:
-                f.write(f"\n--- 標準エラー出力 ---\n{stderr}\n")
-                
-            f.write("\n\n")
+        parts.append("\n\n")
+        
+        # レポート1件をキューに積み、書き込みスレッドがまとめて追記する（終了時に必ず書き出される）
+        _get_error_queue().put(''.join(parts))
             
         logger.info(f"エラー情報を {ERROR_REPORT_FILE} に記録しました")
     except Exception as e:
         logger.error(f"エラー情報の記録中にエラーが発生しました: {e}")
 
 # ユーザーとグループ情報の取得
-def get_user_group_info(config, logger, output_format="excel"):
+def get_user_group_info(config, logger, output_format="excel", timestamp=None, cache_ttl=0):
     """
     kintone_get_user_group の機能を呼び出してユーザーとグループ情報を取得
+    
+    Args:
+        config (dict): 設定情報
+        logger (Logger): ロガーオブジェクト
+        output_format (str): 出力形式
+        timestamp (str, optional): 出力ファイル名に付与する日時（省略時は RUN_TIMESTAMP）
+        cache_ttl (int, optional): ユーザー・グループの取得結果を再利用する秒数（0 の場合はキャッシュしない）
     """
     logger.info("ユーザーとグループ情報の取得を開始します")
     
@@ -241,24 +696,26 @@ def get_user_group_info(config, logger, output_format="excel"):
         logger.error(f"スクリプトファイルが見つかりません: {script_path}")
         return False
     
-    # 出力ディレクトリが存在しない場合は作成
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = timestamp or RUN_TIMESTAMP
     output_file = OUTPUT_DIR / f"kintone_users_groups_{timestamp}.xlsx"
     
+    # パスワードはコマンドライン引数ではなく環境変数で渡す（プロセス一覧やログに残さないため）。
+    # 環境変数はこのスクリプトの実行中のみ設定し、以降の子プロセスには引き継がない
+    script_env = {"KINTONE_PASSWORD": config["password"]}
     cmd = [
         sys.executable, 
         str(script_path),
         "--subdomain", config["subdomain"],
         "--username", config["username"],
-        "--password", config["password"],
         "--output", str(output_file)
     ]
+    if cache_ttl:
+        cmd.extend(["--cache-ttl", str(cache_ttl)])
     
     try:
-        logger.info(f"実行コマンド: {' '.join(cmd).replace(config['password'], '********')}")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"実行コマンド: {_mask_cmd(cmd)}")
+        result = _run_script(cmd, env=script_env)
         logger.info(f"ユーザーとグループ情報を {output_file} に出力しました")
         logger.debug(f"出力: {result.stdout}")
         return str(output_file)
@@ -276,13 +733,14 @@ def get_user_group_info(config, logger, output_format="excel"):
         )
         return False
 
-def get_app_json(config, logger, app_id=None):
+def get_app_json(config, logger, app_id=None, jobs=None):
     """
     get_app_json を使って複数のスクリプトを順に実行するラッパー関数
 
     :param config: 設定 dict
     :param logger: ロガー
     :param app_id: アプリID（指定しない場合は全アプリ）
+    :param jobs: アプリ単位の並列実行数（None の場合は自動）
     :return: すべての処理が成功したら True、それ以外は False
     """
     scripts_to_run = [
@@ -292,7 +750,7 @@ def get_app_json(config, logger, app_id=None):
     scripts_get_app_json = "download2yaml_excel.py"
     script = scripts_get_app_json
     logger.info(f"==== スクリプト [{script}] の実行開始 ====")
-    result = get_app_json_do(config, logger, app_id=app_id, script_filename=script)
+    result = get_app_json_do(config, logger, app_id=app_id, script_filename=script, jobs=jobs)
     if not result:
         logger.error(f"スクリプト [{script}] の実行に失敗しました")
         return False
@@ -305,7 +763,7 @@ def get_app_json(config, logger, app_id=None):
     ]
     for script in scripts_to_run:
         logger.info(f"==== スクリプト [{script}] の実行開始 ====")
-        result = get_app_json_do(config, logger, app_id=app_id, script_filename=script)
+        result = get_app_json_do(config, logger, app_id=app_id, script_filename=script, jobs=jobs)
         if not result:
             logger.error(f"スクリプト [{script}] の実行に失敗しました")
             return False
@@ -315,7 +773,7 @@ def get_app_json(config, logger, app_id=None):
 
     return True
 
-def get_app_json_do(config, logger, app_id=None, script_filename="download2yaml_excel.py"):
+def get_app_json_do(config, logger, app_id=None, script_filename="download2yaml_excel.py", jobs=None):
     """
     指定したスクリプトを使ってアプリのJSONデータを取得／処理します。
 
@@ -323,6 +781,7 @@ def get_app_json_do(config, logger, app_id=None, script_filename="download2yaml_
     :param logger: ロガーオブジェクト
     :param app_id: 取得対象のアプリID（None の場合は全アプリを処理）
     :param script_filename: 実行する Python スクリプト名
+    :param jobs: アプリ単位の並列実行数（None の場合は min(DEFAULT_MAX_WORKERS, アプリ数)）
     :return: 成功したら True、いずれかで失敗したら False
     """
     logger.info(f"スクリプト [{script_filename}] を使ってアプリのJSONデータ取得を開始します")
@@ -332,55 +791,47 @@ def get_app_json_do(config, logger, app_id=None, script_filename="download2yaml_
         logger.error(f"スクリプトファイルが見つかりません: {script_path}")
         return False
 
-    # 出力ディレクトリを準備
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
     # 設定から app_tokens を取得
     app_tokens = config.get('app_tokens', {})
-    logger.info(
-        "app_tokens: "
-        + ", ".join(f"{k}: {v[:4]}***{v[-4:]}" for k, v in app_tokens.items())
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "app_tokens: "
+            + ", ".join(f"{k}: {v[:4]}***{v[-4:]}" for k, v in app_tokens.items())
+        )
 
     # 処理対象リストを作成
+    # app_tokens のキーは load_env_config で文字列に揃えてある
     items = []
     if app_id is not None:
-        # 単一のアプリID指定時は、文字列キー／数値キーの両方をチェック
-        token = None
         key_str = str(app_id)
-        if key_str in app_tokens:
-            token = app_tokens[key_str]
-        elif app_id in app_tokens:
-            token = app_tokens[app_id]
-        else:
+        token = app_tokens.get(key_str)
+        if token is None:
             logger.error(f"アプリID {app_id} の API トークンが設定されていません")
             return False
         items = [(key_str, token)]
     else:
         # 全アプリを処理
-        items = [(str(k), v) for k, v in app_tokens.items()]
+        items = list(app_tokens.items())
 
-    success = True
-    for aid, api_token in items:
+    # アプリ間で共通のコマンド要素とログ用の文字列はループの外で1回だけ組み立てる
+    script_path_str = str(script_path)
+    credentials = [config["subdomain"], config["username"], config["password"]]
+    masked_credentials = f"{config['subdomain']} {config['username']} ********"
+
+    def run_one(aid, api_token):
         logger.info(f"アプリID {aid} の処理を開始します")
-        cmd = [
-            sys.executable,
-            str(script_path),
-            aid,
-            api_token,
-            config["subdomain"],
-            config["username"],
-            config["password"],
-        ]
-        logger.info(
-            f"実行コマンド: python {script_path} {aid} ****** "
-            f"{config['subdomain']} {config['username']} ********"
-        )
+        cmd = [sys.executable, script_path_str, aid, api_token, *credentials]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"実行コマンド: python {script_path_str} {aid} ****** {masked_credentials}")
 
         try:
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            if script_pool is None:
+                result = _run_script(cmd)
+            else:
+                result = _run_script_in_pool(script_pool, cmd)
             logger.info(f"アプリID {aid} の JSON データを取得しました")
             logger.debug(f"標準出力:\n{result.stdout}")
+            return True
         except subprocess.CalledProcessError as e:
             logger.error(f"アプリID {aid} 取得中にエラー: {e}")
             logger.error(f"stdout:\n{e.stdout}")
@@ -393,7 +844,30 @@ def get_app_json_do(config, logger, app_id=None, script_filename="download2yaml_
                 stderr=e.stderr,
                 context=f"アプリID {aid} のJSONデータ取得",
             )
-            success = False
+            return False
+
+    if not items:
+        return True
+
+    # アプリごとの処理は互いに独立（出力先も {app_id}_* で別）なので並列に実行する
+    # 取得後のHTML解析・Excel出力はCPU処理のため、複数アプリの場合はワーカープロセスで実行する
+    # 1件のみの場合はスレッドを使わずに実行する（メインスレッドから呼ばれていれば同一プロセス内で実行される）
+    if len(items) == 1:
+        script_pool = None
+        return run_one(*items[0])
+    
+    max_workers = jobs or min(DEFAULT_MAX_WORKERS, len(items))
+    script_pool = _create_script_pool(max_workers, len(items))
+    success = True
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(run_one, aid, api_token): aid for aid, api_token in items}
+            for future in as_completed(futures):
+                if not future.result():
+                    success = False
+    finally:
+        if script_pool is not None:
+            script_pool.shutdown()
 
     return success
 
@@ -446,7 +920,7 @@ def manage_groups(config, logger, action, params=None):
     
     try:
         logger.info(f"実行コマンド: {' '.join(cmd)}")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        result = _run_script(cmd, capture_stdout=True)
         logger.info(f"グループ操作 '{action}' が完了しました")
         logger.info(f"出力: {result.stdout}")
         
@@ -488,10 +962,27 @@ def find_existing_directory(base_dir, app_id):
     Returns:
         Path: 見つかったディレクトリのパス、見つからない場合はNone
     """
-    return next((d for d in base_dir.iterdir() if d.is_dir() and d.name.startswith(f"{app_id}_")), None)
+    return _index_app_dirs(base_dir).get(str(app_id))
+
+def _index_app_dirs(base_dir):
+    """
+    ディレクトリ内の「[アプリID]_」で始まるディレクトリを1回の走査で索引化する
+    
+    Args:
+        base_dir (Path): 走査する基準ディレクトリ
+    
+    Returns:
+        dict: アプリID（文字列）をキー、ディレクトリのパスを値とする辞書
+    """
+    index = {}
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and '_' in entry.name:
+                index.setdefault(entry.name.split('_', 1)[0], Path(entry.path))
+    return index
 
 # ACLをExcelに変換
-def generate_acl_excel(config, logger, app_id=None):
+def generate_acl_excel(config, logger, app_id=None, jobs=None):
     """
     kintone_get_appjson の aclJson_to_excel.py を使用してACL情報をExcelに変換する
     
@@ -499,20 +990,21 @@ def generate_acl_excel(config, logger, app_id=None):
         config (dict): 設定情報
         logger (Logger): ロガーオブジェクト
         app_id (int, optional): アプリID
+        jobs (int, optional): アプリ単位の並列実行数
     
     Returns:
         str: 生成されたExcelファイルのパス、または失敗した場合はFalse
     """
-    return generate_excel_proc(config, logger, app_id=app_id, script_filename="aclJson_to_excel.py", excel_filename="acl_report.xlsx")
+    return generate_excel_proc(config, logger, app_id=app_id, script_filename="aclJson_to_excel.py", excel_filename="acl_report.xlsx", jobs=jobs)
 
-def generate_notifications_excel(config, logger, app_id=None):
-    return generate_excel_proc(config, logger, app_id=app_id, script_filename="notifications_to_excel.py", excel_filename="notifications.xlsx")
+def generate_notifications_excel(config, logger, app_id=None, jobs=None):
+    return generate_excel_proc(config, logger, app_id=app_id, script_filename="notifications_to_excel.py", excel_filename="notifications.xlsx", jobs=jobs)
 
-def generate_process_workflow_excel(config, logger, app_id=None):
-    return generate_excel_proc(config, logger, app_id=app_id, script_filename="process_workflow_to_excel.py", excel_filename="process_workflow.xlsx")
+def generate_process_workflow_excel(config, logger, app_id=None, jobs=None):
+    return generate_excel_proc(config, logger, app_id=app_id, script_filename="process_workflow_to_excel.py", excel_filename="process_workflow.xlsx", jobs=jobs)
 
 # 通知設定をExcelに出力
-def generate_excel_proc(config, logger, app_id=None, script_filename="notifications_to_excel.py", excel_filename="notifications.xlsx"):
+def generate_excel_proc(config, logger, app_id=None, script_filename="notifications_to_excel.py", excel_filename="notifications.xlsx", jobs=None):
     """
     kintone_get_appjson の pythonファイル を使用して通知設定をExcelに変換する
     
@@ -520,6 +1012,7 @@ def generate_excel_proc(config, logger, app_id=None, script_filename="notificati
         config (dict): 設定情報
         logger (Logger): ロガーオブジェクト
         app_id (int, optional): アプリID
+        jobs (int, optional): 全アプリ処理時の並列実行数（None の場合は min(DEFAULT_MAX_WORKERS, アプリ数)）
     
     Returns:
         str: 生成されたExcelファイルのパス、または失敗した場合はFalse
@@ -534,19 +1027,12 @@ def generate_excel_proc(config, logger, app_id=None, script_filename="notificati
     
     # app_tokensからアプリIDとAPIトークンを取得
     app_tokens = config.get('app_tokens', {})
-    logger.info(f"app_tokens: {app_tokens}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"app_tokens: {', '.join(app_tokens)}")
     
     if app_id:
-        # 特定のアプリIDが指定された場合
-        app_id_str = str(app_id)
-        app_id_int = int(app_id)
-        
-        # 文字列キーと整数キーの両方をチェック
-        if app_id_str in app_tokens:
-            pass
-        elif app_id_int in app_tokens:
-            pass
-        else:
+        # 特定のアプリIDが指定された場合（app_tokens のキーは文字列に揃えてある）
+        if str(app_id) not in app_tokens:
             logger.error(f"アプリID {app_id} のAPIトークンが設定されていません")
             return False
             
@@ -568,7 +1054,7 @@ def generate_excel_proc(config, logger, app_id=None, script_filename="notificati
         
         try:
             logger.info(f"実行コマンド: python {script_path} {app_id} --output {output_file}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            result = _run_script(cmd)
             logger.info(f"アプリID {app_id} の{script_filename}処理の出力を {output_file} に出力しました")
             logger.debug(f"出力: {result.stdout}")
             return str(output_file)
@@ -587,33 +1073,36 @@ def generate_excel_proc(config, logger, app_id=None, script_filename="notificati
             return False
     else:
         # 全てのアプリを処理
-        success = True
-        generated_files = []
+        app_dirs = _index_app_dirs(OUTPUT_DIR)
+        script_path_str = str(script_path)
         
-        for app_id in app_tokens.keys():
-            # [app_id]_ で始まるディレクトリを探す
-            output_dir = find_existing_directory(OUTPUT_DIR, str(app_id))
+        def run_one(app_id):
+            # [app_id]_ で始まるディレクトリを探す（app_tokens のキーは文字列に揃えてある）
+            output_dir = app_dirs.get(app_id)
             
             if not output_dir:
                 logger.error(f"アプリID {app_id} に対応するディレクトリが見つかりません")
-                success = False
-                continue
+                return None
             
-            output_file = output_dir / f"{app_id}_{excel_filename}"
+            output_file = str(output_dir / f"{app_id}_{excel_filename}")
             
             cmd = [
                 sys.executable,
-                str(script_path),
-                str(app_id),
-                "--output", str(output_file)
+                script_path_str,
+                app_id,
+                "--output", output_file
             ]
             
             try:
-                logger.info(f"実行コマンド: python {script_path} {app_id} --output {output_file}")
-                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"実行コマンド: python {script_path_str} {app_id} --output {output_file}")
+                if render_pool is None:
+                    result = _run_script(cmd)
+                else:
+                    result = _run_script_in_pool(render_pool, cmd)
                 logger.info(f"アプリID {app_id} の通知設定を {output_file} に出力しました")
                 logger.debug(f"出力: {result.stdout}")
-                generated_files.append(str(output_file))
+                return output_file
             except subprocess.CalledProcessError as e:
                 logger.error(f"アプリID {app_id} の通知設定のExcel変換中にエラーが発生しました: {e}")
                 logger.error(f"標準出力: {e.stdout}")
@@ -626,175 +1115,414 @@ def generate_excel_proc(config, logger, app_id=None, script_filename="notificati
                     stderr=e.stderr, 
                     context=f"アプリID {app_id} の通知設定のExcel変換"
                 )
-                success = False
+                return None
         
-        if success and generated_files:
-            return generated_files
-        elif generated_files:
+        if not app_tokens:
+            return False
+        
+        # アプリごとの変換は出力先も {app_id}_* で別々のため並列に実行する（結果は app_tokens の順序を保つ）
+        # 1件のみの場合はスレッドを使わずに実行する（メインスレッドから呼ばれていれば同一プロセス内で実行される）
+        max_workers = jobs or min(DEFAULT_MAX_WORKERS, len(app_tokens))
+        render_pool = _create_script_pool(max_workers, len(app_tokens))
+        try:
+            if len(app_tokens) == 1:
+                results = [run_one(app_id) for app_id in app_tokens]
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(run_one, app_tokens.keys()))
+        finally:
+            if render_pool is not None:
+                render_pool.shutdown()
+        
+        generated_files = [output_file for output_file in results if output_file]
+        if generated_files:
             return generated_files
         else:
             return False
 
-# ディレクトリ操作関数
-def prepare_directories():
-    """
-    ディレクトリの準備:
-    1. PREVIOUS_OUTPUT_DIRを空にする
-    2. OUTPUT_DIRの内容をPREVIOUS_OUTPUT_DIRに移動
-    3. OUTPUT_DIRを作成
+# アプリ設定一覧表の生成
+def generate_app_settings_summary(logger, output_file=None):
     """
-    import shutil
-    import logging
-    logger = logging.getLogger("kintone_runner")
-    
-    # Excelファイルが開かれているかどうかを確認するフラグ
-    excel_files_open = False
-    excel_files_list = []
+    app_settings_summary.py を使用してアプリ設定一覧表を生成する
+    スクリプトの出力は取り込まずにそのまま画面に出力する（他の処理と並行して実行できるようにするため）
     
-    # 各ディレクトリが存在しない場合は作成
-    for directory in [OUTPUT_DIR, PREVIOUS_OUTPUT_DIR, BACKUP_DIR]:
-        directory.mkdir(exist_ok=True)
+    Args:
+        logger (Logger): ロガーオブジェクト
+        output_file (str, optional): 出力するExcelファイルのパス
     
-    # PREVIOUS_OUTPUT_DIRを空にする
-    if PREVIOUS_OUTPUT_DIR.exists():
-        for item in PREVIOUS_OUTPUT_DIR.iterdir():
-            if item.is_file():
-                try:
-                    item.unlink()
-                except PermissionError:
-                    if item.name.startswith("~$"):
-                        excel_files_open = True
-                        excel_files_list.append(item.name[2:])  # "~$"を除いたファイル名
-                        logger.warning(f"ファイル {item.name[2:]} はExcelで開かれているため削除できません。")
-                    else:
-                        logger.warning(f"ファイル {item.name} へのアクセスが拒否されました。")
-            elif item.is_dir():
-                try:
-                    shutil.rmtree(item)
-                except (PermissionError, OSError) as e:
-                    logger.warning(f"ディレクトリ {item.name} の削除中にエラーが発生しました: {e}")
+    Returns:
+        bool: 生成に成功した場合はTrue、スキップまたは失敗した場合はFalse
+    """
+    logger.info("アプリ設定一覧表の生成を開始します")
+    script_path = SCRIPT_DIR / "app_settings_summary.py"
     
-    # OUTPUT_DIRの内容をPREVIOUS_OUTPUT_DIRに移動
-    if OUTPUT_DIR.exists():
-        for item in OUTPUT_DIR.iterdir():
-            try:
-                if item.is_file():
-                    # Excelの一時ファイルをチェック
-                    if item.name.startswith("~$"):
-                        excel_files_open = True
-                        excel_files_list.append(item.name[2:])  # "~$"を除いたファイル名
-                        logger.warning(f"Excelファイル {item.name[2:]} が開かれています。")
-                        continue
-                    shutil.move(str(item), str(PREVIOUS_OUTPUT_DIR / item.name))
-                elif item.is_dir():
-                    # ディレクトリ内にExcelの一時ファイルがないか確認
-                    for file in item.glob("~$*"):
-                        excel_files_open = True
-                        excel_files_list.append(file.name[2:])  # "~$"を除いたファイル名
-                        logger.warning(f"ディレクトリ {item.name} 内のExcelファイル {file.name[2:]} が開かれています。")
-                    
-                    # Excelが開かれていない場合は通常通り移動
-                    shutil.move(str(item), str(PREVIOUS_OUTPUT_DIR / item.name))
-            except (PermissionError, OSError) as e:
-                if "~$" in str(e):
-                    excel_files_open = True
-                    logger.warning(f"Excelファイルが開かれているため、ファイルを移動できませんでした。")
-                else:
-                    logger.warning(f"ファイルまたはディレクトリの移動中にエラーが発生しました: {e}")
+    if not script_path.exists():
+        logger.warning(f"スクリプトファイル {script_path} が見つからないため、アプリ設定一覧表の生成をスキップします")
+        return False
     
-    # Excelファイルが開かれている場合は例外を発生させる
-    if excel_files_open:
-        files_str = ", ".join(excel_files_list)
-        error_msg = f"以下のExcelファイルが開かれているため処理を続行できません: {files_str}"
-        logger.error(error_msg)
-        raise PermissionError(error_msg)
+    cmd = [sys.executable, str(script_path)]
+    if output_file:
+        cmd.extend(["--output", output_file])
     
-    # OUTPUT_DIRを作成（移動後に空になっている可能性があるため）
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    logger.info("ディレクトリの準備が完了しました。")
+    try:
+        logger.info(f"実行コマンド: {' '.join(cmd)}")
+        _run_script(cmd)
+        logger.info("アプリ設定一覧表の生成が完了しました")
+        return True
+    except subprocess.CalledProcessError as e:
+        logger.error(f"アプリ設定一覧表の生成中にエラーが発生しました: {e}")
+        logger.error(f"標準エラー: {e.stderr}")
+        log_error_to_file(
+            logger, 
+            e, 
+            command=cmd, 
+            stdout=e.stdout, 
+            stderr=e.stderr, 
+            context="アプリ設定一覧表の生成"
+        )
+        return False
 
-# 特定のアプリIDに関連するディレクトリのみを準備する関数
-def prepare_app_directories(app_id):
+# ディレクトリ操作関数
+class ExcelFileOpenError(PermissionError):
     """
-    特定のアプリID向けのディレクトリ準備:
-    1. PREVIOUS_OUTPUT_DIRの指定アプリIDのディレクトリのみを削除
-    2. OUTPUT_DIRの指定アプリIDのディレクトリをPREVIOUS_OUTPUT_DIRに移動
-    3. OUTPUT_DIRを作成
+    Excelファイルが開かれているためディレクトリの準備を続行できないことを示す例外
+    （prepare_directories / prepare_app_directories が送出する）
+    """
+
+def _is_excel_lock_error(e):
+    """
+    例外がExcelでファイルが開かれていることによるものかを判定する
+    例外メッセージを文字列化せず、対象ファイル名（とWindowsのエラーコード）のみで判定する
     
     Args:
-        app_id (int): 処理対象のアプリID
+        e (Exception): 判定する例外
+    
+    Returns:
+        bool: Excelでファイルが開かれていることによる例外の場合はTrue
+    """
+    filenames = [str(filename) for filename in (getattr(e, 'filename', None), getattr(e, 'filename2', None)) if filename]
+    if any("~$" in filename for filename in filenames):
+        return True
+    # ERROR_SHARING_VIOLATION（他のプロセスがファイルを使用中）は、対象がExcelファイルの場合のみ該当とする
+    return getattr(e, 'winerror', None) == 32 and any(
+        filename.lower().endswith(EXCEL_SUFFIXES) for filename in filenames
+    )
+
+def _move_path(src, dst):
     """
-    import shutil
-    import logging
-    logger = logging.getLogger("kintone_runner")
+    ファイルまたはディレクトリを移動する
+    同一ファイルシステム上では os.replace で名前を付け替えるだけにし、
+    別ボリュームへの移動（EXDEV）の場合のみ shutil.move でコピーする
     
-    # Excelファイルが開かれているかどうかを確認するフラグ
+    Args:
+        src (str): 移動元のパス
+        dst (str): 移動先のパス
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # 別ボリュームのためコピーと削除で移動する（ディレクトリを同じボリュームに置くと名前の付け替えで済む）
+        logger.info(f"{src} は別ボリュームへの移動のため、コピーして移動します")
+        shutil.move(src, dst)
+
+def _collect_excel_locks(root):
+    """
+    ディレクトリ配下を1回走査し、Excelの一時ファイル（~$*）から開かれているファイル名を集める
+    
+    Args:
+        root (Path): 確認するディレクトリ
+    
+    Returns:
+        list: 開かれているExcelファイル名（"~$"を除いたもの）
+    """
+    locked = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in filenames:
+            if name.startswith("~$"):
+                locked.append(name[2:])
+                logger.warning(f"Excelファイル {name[2:]} が開かれています（{dirpath}）。")
+    return locked
+
+def _excel_open_error(excel_files_list):
+    """
+    Excelファイルが開かれていることを示す例外を作成する（エラーログも出力する）
+    
+    Args:
+        excel_files_list (list): 開かれているExcelファイル名
+    
+    Returns:
+        ExcelFileOpenError: 呼び出し元で送出する例外
+    """
+    files_str = ", ".join(excel_files_list)
+    error_msg = f"以下のExcelファイルが開かれているため処理を続行できません: {files_str}"
+    logger.error(error_msg)
+    return ExcelFileOpenError(error_msg)
+
+def _is_process_alive(pid):
+    """
+    指定したプロセスIDのプロセスが実行中かを判定する（判定できない場合は実行中とみなす）
+    
+    Args:
+        pid (int): 判定するプロセスID
+    
+    Returns:
+        bool: 実行中の場合はTrue
+    """
+    if os.name == 'nt':
+        # Windows の os.kill はプロセスを終了させるため、OpenProcess と終了コードで判定する
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            # アクセス拒否の場合はプロセスが存在する
+            return kernel32.GetLastError() == ERROR_ACCESS_DENIED
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _remove_trash_dirs(trash_dir):
+    """
+    前回の出力の削除待ちディレクトリを削除する
+    
+    あわせて、中断された過去の実行が残した削除待ちディレクトリ（.trash_<プロセスID>）のうち、
+    そのプロセスが終了しているものを削除する（並行して実行中の別プロセスのものは削除しない）。
+    
+    Args:
+        trash_dir (Path): この実行で作成した削除待ちディレクトリ
+    """
+    shutil.rmtree(trash_dir, ignore_errors=True)
+    for stale_dir in SCRIPT_DIR.glob(TRASH_DIR_PREFIX + "*"):
+        pid = stale_dir.name[len(TRASH_DIR_PREFIX):]
+        if not pid.isdigit() or not stale_dir.is_dir():
+            continue
+        if not _is_process_alive(int(pid)):
+            shutil.rmtree(stale_dir, ignore_errors=True)
+
+def _rotate_output_dirs():
+    """
+    OUTPUT_DIR を丸ごと PREVIOUS_OUTPUT_DIR に名前変更する（要素ごとの削除・移動を行わない高速経路）
+    
+    Excelの一時ファイルがないことは呼び出し元で確認済みとする。名前変更に失敗した場合
+    （別ボリューム、使用中など）は何も変更せずにFalseを返し、呼び出し元は要素ごとに処理する。
+    
+    Returns:
+        bool: 名前変更で準備が完了した場合はTrue
+    """
+    trash_dir = SCRIPT_DIR / f"{TRASH_DIR_PREFIX}{os.getpid()}"
+    try:
+        os.rename(PREVIOUS_OUTPUT_DIR, trash_dir)
+    except OSError:
+        return False
+    try:
+        os.rename(OUTPUT_DIR, PREVIOUS_OUTPUT_DIR)
+    except OSError:
+        # 元に戻して要素ごとの処理に任せる
+        try:
+            os.rename(trash_dir, PREVIOUS_OUTPUT_DIR)
+        except OSError as e:
+            # 前回の出力は削除せずに残し、要素ごとの処理が続けられるように空の PREVIOUS_OUTPUT_DIR を用意する
+            logger.error(f"前回の出力を {PREVIOUS_OUTPUT_DIR} に戻せませんでした: {e}")
+            logger.error(f"前回の出力は {trash_dir} に残っています（次回の実行時に削除されます）")
+            PREVIOUS_OUTPUT_DIR.mkdir(exist_ok=True)
+        return False
+    
+    try:
+        # _ensure_dir はキャッシュ済みのため、名前変更で無くなった OUTPUT_DIR は直接作成する
+        OUTPUT_DIR.mkdir()
+    finally:
+        # 前回の出力と、終了済みの過去の実行が残した削除待ちディレクトリの削除は以降の処理と並行して行う
+        # （デーモンではないため、終了時には削除の完了を待つ）
+        threading.Thread(target=_remove_trash_dirs, args=(trash_dir,), name="trash-remover").start()
+    return True
+
+def prepare_directories():
+    """
+    ディレクトリの準備:
+    1. PREVIOUS_OUTPUT_DIRを空にする
+    2. OUTPUT_DIRの内容をPREVIOUS_OUTPUT_DIRに移動
+    3. OUTPUT_DIRを作成
+    """
+    # Excelファイルが開かれているかどうかを確認するフラグ
     excel_files_open = False
     excel_files_list = []
     
     # 各ディレクトリが存在しない場合は作成
-    for directory in [OUTPUT_DIR, PREVIOUS_OUTPUT_DIR, BACKUP_DIR]:
-        directory.mkdir(exist_ok=True)
+    _ensure_dirs_once()
     
-    # PREVIOUS_OUTPUT_DIRの指定アプリIDのディレクトリのみを削除
+    # OUTPUT_DIR のExcelの一時ファイルを先にまとめて確認し、開かれている場合は何も移動せずに終了する。
+    # PREVIOUS_OUTPUT_DIR の一時ファイルはExcelの異常終了で残っただけの場合もあるため、
+    # 従来どおり削除を試み、削除できなかった（実際に開かれている）場合のみ開かれているものとして扱う
+    locked_files = _collect_excel_locks(OUTPUT_DIR)
+    if locked_files:
+        raise _excel_open_error(locked_files)
+    
+    # 同一ファイルシステム上であれば、ディレクトリの名前変更2回で済ませる
+    if _rotate_output_dirs():
+        logger.info("ディレクトリの準備が完了しました。")
+        return
+    
+    # PREVIOUS_OUTPUT_DIRを空にする
+    # os.scandir はエントリ種別をディレクトリ読み出し結果から得るため、要素ごとの stat を省ける
     if PREVIOUS_OUTPUT_DIR.exists():
-        app_dir = find_existing_directory(PREVIOUS_OUTPUT_DIR, str(app_id))
-        if app_dir and app_dir.exists():
-            try:
-                for file in app_dir.glob("~$*"):
-                    excel_files_open = True
-                    excel_files_list.append(file.name[2:])
-                    logger.warning(f"ディレクトリ {app_dir.name} 内のExcelファイル {file.name[2:]} が開かれています。")
-                
-                if not excel_files_open:
-                    shutil.rmtree(app_dir)
-                    logger.info(f"PREVIOUS_OUTPUT_DIRから {app_dir.name} を削除しました")
-            except (PermissionError, OSError) as e:
-                if "~$" in str(e):
-                    excel_files_open = True
-                    logger.warning(f"Excelファイルが開かれているため、ディレクトリを削除できませんでした。")
-                else:
-                    logger.warning(f"ディレクトリ {app_dir.name} の削除中にエラーが発生しました: {e}")
+        with os.scandir(PREVIOUS_OUTPUT_DIR) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    try:
+                        os.unlink(entry.path)
+                    except PermissionError:
+                        if entry.name.startswith("~$"):
+                            excel_files_open = True
+                            excel_files_list.append(entry.name[2:])  # "~$"を除いたファイル名
+                            logger.warning(f"ファイル {entry.name[2:]} はExcelで開かれているため削除できません。")
+                        else:
+                            logger.warning(f"ファイル {entry.name} へのアクセスが拒否されました。")
+                elif entry.is_dir(follow_symlinks=False):
+                    try:
+                        shutil.rmtree(entry.path)
+                    except (PermissionError, OSError) as e:
+                        logger.warning(f"ディレクトリ {entry.name} の削除中にエラーが発生しました: {e}")
     
-    # OUTPUT_DIRの指定アプリIDのディレクトリをPREVIOUS_OUTPUT_DIRに移動
+    # OUTPUT_DIRの内容をPREVIOUS_OUTPUT_DIRに移動
     if OUTPUT_DIR.exists():
-        app_dir = find_existing_directory(OUTPUT_DIR, str(app_id))
-        if app_dir and app_dir.exists():
-            try:
-                # ディレクトリ内にExcelの一時ファイルがないか確認
-                for file in app_dir.glob("~$*"):
-                    excel_files_open = True
-                    excel_files_list.append(file.name[2:])
-                    logger.warning(f"ディレクトリ {app_dir.name} 内のExcelファイル {file.name[2:]} が開かれています。")
-                
-                # Excelが開かれていない場合は移動
-                if not excel_files_open:
-                    shutil.move(str(app_dir), str(PREVIOUS_OUTPUT_DIR / app_dir.name))
-                    logger.info(f"OUTPUT_DIRから {app_dir.name} をPREVIOUS_OUTPUT_DIRに移動しました")
-            except (PermissionError, OSError) as e:
-                if "~$" in str(e):
-                    excel_files_open = True
-                    logger.warning(f"Excelファイルが開かれているため、ディレクトリを移動できませんでした。")
-                else:
-                    logger.warning(f"ディレクトリ {app_dir.name} の移動中にエラーが発生しました: {e}")
+        previous_dir = str(PREVIOUS_OUTPUT_DIR)
+        with os.scandir(OUTPUT_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False) or entry.is_dir(follow_symlinks=False):
+                        _move_path(entry.path, os.path.join(previous_dir, entry.name))
+                except (PermissionError, OSError) as e:
+                    if _is_excel_lock_error(e):
+                        excel_files_open = True
+                        logger.warning(f"Excelファイルが開かれているため、ファイルを移動できませんでした。")
+                    else:
+                        logger.warning(f"ファイルまたはディレクトリの移動中にエラーが発生しました: {e}")
+    
+    # Excelファイルが開かれている場合は例外を発生させる
+    if excel_files_open:
+        raise _excel_open_error(excel_files_list)
+    
+    # OUTPUT_DIRを作成（移動後に空になっている可能性があるため）
+    _ensure_dir(OUTPUT_DIR)
+    logger.info("ディレクトリの準備が完了しました。")
+
+# 特定のアプリIDに関連するディレクトリのみを準備する関数
+def prepare_app_directories(app_id):
+    """
+    特定のアプリID向けのディレクトリ準備:
+    1. PREVIOUS_OUTPUT_DIRの指定アプリIDのディレクトリのみを削除
+    2. OUTPUT_DIRの指定アプリIDのディレクトリをPREVIOUS_OUTPUT_DIRに移動
+    3. OUTPUT_DIRを作成
+    
+    Args:
+        app_id (int): 処理対象のアプリID
+    """
+    # Excelファイルが開かれているかどうかを確認するフラグ
+    excel_files_open = False
+    excel_files_list = []
+    
+    # 各ディレクトリが存在しない場合は作成
+    _ensure_dirs_once()
+    
+    previous_app_dir = _index_app_dirs(PREVIOUS_OUTPUT_DIR).get(str(app_id))
+    output_app_dir = _index_app_dirs(OUTPUT_DIR).get(str(app_id))
+    
+    # Excelの一時ファイルを先にまとめて確認し、開かれている場合は何も変更せずに終了する
+    locked_files = []
+    for app_dir in (previous_app_dir, output_app_dir):
+        if app_dir:
+            locked_files += _collect_excel_locks(app_dir)
+    if locked_files:
+        raise _excel_open_error(locked_files)
+    
+    # PREVIOUS_OUTPUT_DIRの指定アプリIDのディレクトリのみを削除
+    if previous_app_dir:
+        try:
+            shutil.rmtree(previous_app_dir)
+            logger.info(f"PREVIOUS_OUTPUT_DIRから {previous_app_dir.name} を削除しました")
+        except (PermissionError, OSError) as e:
+            if _is_excel_lock_error(e):
+                excel_files_open = True
+                logger.warning(f"Excelファイルが開かれているため、ディレクトリを削除できませんでした。")
+            else:
+                logger.warning(f"ディレクトリ {previous_app_dir.name} の削除中にエラーが発生しました: {e}")
+    
+    # OUTPUT_DIRの指定アプリIDのディレクトリをPREVIOUS_OUTPUT_DIRに移動
+    if output_app_dir and not excel_files_open:
+        try:
+            _move_path(str(output_app_dir), str(PREVIOUS_OUTPUT_DIR / output_app_dir.name))
+            logger.info(f"OUTPUT_DIRから {output_app_dir.name} をPREVIOUS_OUTPUT_DIRに移動しました")
+        except (PermissionError, OSError) as e:
+            if _is_excel_lock_error(e):
+                excel_files_open = True
+                logger.warning(f"Excelファイルが開かれているため、ディレクトリを移動できませんでした。")
+            else:
+                logger.warning(f"ディレクトリ {output_app_dir.name} の移動中にエラーが発生しました: {e}")
     
     # Excelファイルが開かれている場合は例外を発生させる
     if excel_files_open:
-        files_str = ", ".join(excel_files_list)
-        error_msg = f"以下のExcelファイルが開かれているため処理を続行できません: {files_str}"
-        logger.error(error_msg)
-        raise PermissionError(error_msg)
+        raise _excel_open_error(excel_files_list)
     
     # OUTPUT_DIRを作成（移動後に空になっている可能性があるため）
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    _ensure_dir(OUTPUT_DIR)
     logger.info(f"アプリID {app_id} のディレクトリ準備が完了しました。")
 
-def backup_output():
+def _copy_content(src, dst):
+    """
+    ファイルの内容のみをコピーする（バックアップ用途のため更新日時や権限は引き継がない）
+    
+    os.copy_file_range が利用できる場合はカーネル内でコピーし、対応するファイルシステム
+    （Btrfs、XFS など）ではデータブロックを共有するコピーオンライトのコピーになる。
+    出力ファイルは app / acl / notifications コマンドで同じ名前のまま上書きされることがあるため、
+    元ファイルと実体を共有するハードリンクは使わない。
+    利用できない場合や失敗した場合は shutil.copyfile（Linux では os.sendfile）でコピーする。
+    
+    Args:
+        src (str): コピー元のパス
+        dst (str): コピー先のパス
+    
+    Returns:
+        str: コピー先のパス（shutil.copytree の copy_function として使用するため）
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            # 元ファイルが途中で縮んだ場合や未対応のファイルシステムでは途中で 0 が返るため、
+            # 途中までのコピーを残さずに shutil.copyfile でコピーし直す
+            if remaining == 0:
+                return dst
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+    return dst
+
+def backup_output(timestamp=None):
     """
     OUTPUT_DIRの内容をBACKUP_DIRにバックアップする
     バックアップディレクトリ名: YYYYMMDD_HHMMSS
+    
+    Args:
+        timestamp (str, optional): バックアップディレクトリ名に使う日時（省略時は RUN_TIMESTAMP）
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = timestamp or RUN_TIMESTAMP
     backup_subdir = BACKUP_DIR / timestamp
     
     # バックアップディレクトリを作成
@@ -802,12 +1530,64 @@ def backup_output():
     
     # OUTPUT_DIRの内容をバックアップディレクトリにコピー
     if OUTPUT_DIR.exists():
-        import shutil
-        for item in OUTPUT_DIR.iterdir():
-            if item.is_file():
-                shutil.copy2(str(item), str(backup_subdir / item.name))
-            elif item.is_dir():
-                shutil.copytree(str(item), str(backup_subdir / item.name))
+        with os.scandir(OUTPUT_DIR) as it:
+            _copy_entries(list(it), backup_subdir)
+    
+    return backup_subdir
+
+def _copy_entries(entries, backup_subdir):
+    """
+    os.scandir で取得した要素をバックアップディレクトリにコピーする
+    コピーはディスクI/O待ちが中心のため、トップレベルの要素ごとにスレッドで並行して行う
+    
+    Args:
+        entries (list): コピーする os.DirEntry のリスト
+        backup_subdir (Path): コピー先のディレクトリ
+    """
+    # コピー先のパスは要素ごとに Path を作らず文字列で組み立てる
+    backup_dir = os.fspath(backup_subdir)
+    
+    def copy_item(entry):
+        if entry.is_file():
+            _copy_content(entry.path, os.path.join(backup_dir, entry.name))
+        elif entry.is_dir():
+            shutil.copytree(entry.path, os.path.join(backup_dir, entry.name), copy_function=_copy_content)
+    
+    if entries:
+        with ThreadPoolExecutor(max_workers=min(DEFAULT_MAX_WORKERS, len(entries))) as executor:
+            # list() で結果を取り出し、コピー中の例外を呼び出し元に伝える
+            list(executor.map(copy_item, entries))
+
+def backup_and_rename(src, backup_root, timestamp=None):
+    """
+    src の内容をバックアップし、続けてファイル名とディレクトリ名から日時部分を除去する
+    backup_output と remove_datetime_suffix を順に呼ぶのと同じ結果を、src の1回の走査で行う
+    
+    Args:
+        src (Path): 処理対象のディレクトリ
+        backup_root (Path): バックアップ先の親ディレクトリ
+        timestamp (str, optional): バックアップディレクトリ名に使う日時（省略時は RUN_TIMESTAMP）
+    
+    Returns:
+        Path: 作成したバックアップディレクトリのパス
+    """
+    backup_subdir = backup_root / (timestamp or RUN_TIMESTAMP)
+    backup_subdir.mkdir(exist_ok=True)
+    
+    try:
+        with os.scandir(src) as it:
+            entries = {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        return backup_subdir
+    
+    # リネームで元のパスがなくなるため、先にすべてのコピーを終えてからリネームする
+    _copy_entries(list(entries.values()), backup_subdir)
+    logger.info("ファイル名とディレクトリ名から日時部分を除去します")
+    try:
+        _strip_datetime_suffix(src, entries)
+        logger.info("ファイル名とディレクトリ名からの日時部分の除去が完了しました")
+    except Exception as e:
+        logger.error(f"ファイル名とディレクトリ名の処理中にエラーが発生しました: {e}")
     
     return backup_subdir
 
@@ -818,59 +1598,87 @@ def remove_datetime_suffix(directory):
     Args:
         directory (Path): 処理対象のディレクトリ
     """
-    logger = logging.getLogger("kintone_runner")
     logger.info("ファイル名とディレクトリ名から日時部分を除去します")
     
-    # 日時パターン（_YYYYMMDD_HHMMSS）を定義
-    datetime_pattern = re.compile(r'_\d{8}_\d{6}')
     try:
         # ディレクトリ内のすべてのファイルとディレクトリを処理
-        for item in directory.iterdir():
-            original_name = item.name
-            # 日時部分を除去
-            new_name = datetime_pattern.sub('', original_name)
-            
-            if new_name != original_name:
-                try:
-                    new_path = item.parent / new_name
-                    # 同名のファイルが存在する場合は上書き
-                    if new_path.exists():
-                        if new_path.is_file():
-                            new_path.unlink()
-                        else:
-                            import shutil
-                            shutil.rmtree(new_path)
-                    item.rename(new_path)
-                    logger.info(f"リネーム: {original_name} -> {new_name}")
-                except Exception as e:
-                    logger.error(f"リネーム中にエラーが発生しました ({original_name}): {e}")
+        # （処理中にリネームするため、先に一覧を確定させておく）
+        with os.scandir(directory) as it:
+            entries = {entry.name: entry for entry in it}
+        
+        _strip_datetime_suffix(directory, entries)
         
         logger.info("ファイル名とディレクトリ名からの日時部分の除去が完了しました")
     except Exception as e:
         logger.error(f"ファイル名とディレクトリ名の処理中にエラーが発生しました: {e}")
 
-def main():
-    """メイン関数"""
-    # コマンドライン引数の解析
-    parser = argparse.ArgumentParser(description='Kintone関連ツールの統合実行スクリプト')
-    subparsers = parser.add_subparsers(dest='command', help='実行するコマンド')
+def _strip_datetime_suffix(directory, entries):
+    """
+    os.scandir で取得した要素の名前から日時部分を除去してリネームする
     
+    Args:
+        directory (Path): 処理対象のディレクトリ
+        entries (dict): 名前をキーとした directory 内の os.DirEntry
+    """
+    # リネーム元とリネーム先の組を先に求める。
+    # 同じ名前になるものが複数ある場合は、名前順で最後（日時が最も新しいもの）を採用する
+    renames = {}
+    for original_name in sorted(entries):
+        # 日時部分を含まない名前（'_' がないもの）は正規表現を使わずに除外する
+        if '_' not in original_name:
+            continue
+        match = DATETIME_SUFFIX_PATTERN.search(original_name)
+        if match is None:
+            continue
+        # 日時部分を除去（2つ目以降の日時部分は残りの部分に対してのみ置換する）
+        new_name = original_name[:match.start()] + DATETIME_SUFFIX_PATTERN.sub('', original_name[match.end():])
+        if new_name in renames:
+            logger.warning(f"リネーム先 {new_name} が重複するため {renames[new_name].name} はリネームしません")
+        renames[new_name] = entries[original_name]
+    
+    for new_name, entry in renames.items():
+        try:
+            new_path = os.path.join(directory, new_name)
+            # まず os.replace で置き換える（ファイル同士や空のディレクトリであれば1回の名前変更で済む）
+            # 置き換えられない場合（中身のあるディレクトリ、ファイルとディレクトリの置き換え）のみ
+            # 既存の要素を削除してから置き換える
+            try:
+                os.replace(entry.path, new_path)
+            except OSError:
+                existing = entries.get(new_name)
+                if existing is None:
+                    raise
+                if existing.is_dir(follow_symlinks=False):
+                    shutil.rmtree(existing.path)
+                else:
+                    os.unlink(existing.path)
+                os.replace(entry.path, new_path)
+            logger.info(f"リネーム: {entry.name} -> {new_name}")
+        except Exception as e:
+            logger.error(f"リネーム中にエラーが発生しました ({entry.name}): {e}")
+
+# サブコマンドのパーサー定義
+def _add_users_parser(subparsers):
     # ユーザーグループ取得コマンド
     user_group_parser = subparsers.add_parser('users', help='ユーザーとグループ情報を取得（出力: kintone_users_groups_[日時].xlsx）')
     user_group_parser.add_argument('--format', choices=['excel', 'csv'], default='excel', help='出力形式')
-    
+
+def _add_app_parser(subparsers):
     # アプリJSON取得コマンド
     app_json_parser = subparsers.add_parser('app', help='アプリのJSONデータを取得（出力: [アプリID]_app_settings.json, [アプリID]_form_layout.json など）')
     app_json_parser.add_argument('--id', type=int, help='取得するアプリID')
-    
+
+def _add_acl_parser(subparsers):
     # ACL Excel生成コマンド
     acl_excel_parser = subparsers.add_parser('acl', help='アプリのACL情報をExcelに変換（出力: acl_report_[アプリID]_[日時].xlsx）')
     acl_excel_parser.add_argument('--id', type=int, help='変換するアプリID')
-    
+
+def _add_summary_parser(subparsers):
     # アプリ設定一覧表生成コマンド
     summary_parser = subparsers.add_parser('summary', help='アプリの全体設定一覧表をExcelで出力（出力: kintone_app_settings_summary_[日時].xlsx）')
     summary_parser.add_argument('--output', type=str, help='出力ファイル名')
-    
+
+def _add_group_parser(subparsers):
     # グループ操作コマンド
     group_parser = subparsers.add_parser('group', help='グループ操作')
     group_subparsers = group_parser.add_subparsers(dest='action', help='実行するアクション')
@@ -890,277 +1698,369 @@ def main():
     # ユーザーをグループから削除
     remove_parser = group_subparsers.add_parser('remove', help='ユーザーをグループから削除')
     remove_parser.add_argument('user', help='ユーザーコード')
-    
+
+def _add_notifications_parser(subparsers):
     # 通知設定Excel生成コマンド
     notifications_parser = subparsers.add_parser('notifications', help='アプリの通知設定をExcelに変換（出力: [アプリID]_notifications.xlsx）')
     notifications_parser.add_argument('--id', type=int, help='変換するアプリID')
 
+def _add_process_workflow_parser(subparsers):
     # プロセスワークフローExcel生成コマンド
     process_workflow_parser = subparsers.add_parser('process_workflow', help='アプリのプロセスワークフローをExcelに変換（出力: [アプリID]_process_workflow.xlsx）')
     process_workflow_parser.add_argument('--id', type=int, help='変換するアプリID')
-    
+
+def _add_all_parser(subparsers):
     # 全機能実行コマンド
     all_parser = subparsers.add_parser('all', help='すべての機能を順番に実行（複数の出力ファイルが生成されます）')
     all_parser.add_argument('--id', type=int, nargs='+', help='対象とするアプリID（指定したIDのみ処理）')
     all_parser.add_argument('--not-id', type=int, nargs='+', help='除外するアプリID（指定したID以外を処理）')
-    
+
+def _add_outputs_parser(subparsers):
     # 出力ファイル一覧表示コマンド
     subparsers.add_parser('outputs', help='生成されるExcel/CSV/TSVファイルの一覧と概要を表示')
+
+# コマンド名とパーサー定義関数の対応表（ヘルプの表示順）
+COMMAND_PARSERS = {
+    'users': _add_users_parser,
+    'app': _add_app_parser,
+    'acl': _add_acl_parser,
+    'summary': _add_summary_parser,
+    'group': _add_group_parser,
+    'notifications': _add_notifications_parser,
+    'process_workflow': _add_process_workflow_parser,
+    'all': _add_all_parser,
+    'outputs': _add_outputs_parser,
+}
+
+def build_parser(command=None):
+    """
+    コマンドライン引数のパーサーを構築する
+
+    Args:
+        command (str, optional): 実行するコマンド名。指定した場合はそのサブコマンドのみ構築し、
+            None の場合（ヘルプ表示や不明なコマンド）はすべてのサブコマンドを構築する
+
+    Returns:
+        ArgumentParser: 構築したパーサー
+    """
+    parser = argparse.ArgumentParser(description='Kintone関連ツールの統合実行スクリプト')
+    subparsers = parser.add_subparsers(dest='command', help='実行するコマンド')
+    
+    for name, add_parser in COMMAND_PARSERS.items():
+        if command is None or name == command:
+            add_parser(subparsers)
+    
+    _add_global_options(parser)
     
+    return parser
+
+def _add_global_options(parser):
+    """
+    サブコマンドより前に指定する共通オプションを追加する
+
+    Args:
+        parser (ArgumentParser): オプションを追加するパーサー
+    """
     # 環境ファイルオプション
     parser.add_argument('--env', type=str, help='.kintone.env ファイルのパス')
     
+    # スクリプト実行方式オプション
+    parser.add_argument('--isolate', action='store_true', help='各スクリプトを同一プロセス内ではなく子プロセスで実行する')
+    
+    # 並列実行数オプション
+    parser.add_argument('--jobs', type=int, help=f'アプリ単位の処理を並列実行するワーカー数（省略時は最大{DEFAULT_MAX_WORKERS}）')
+    
+    # ユーザー・グループ取得のキャッシュオプション
+    parser.add_argument('--cache-ttl', type=int, default=0, help='users / all でユーザー・グループの取得結果を再利用する秒数（省略時はキャッシュしない）')
+
+class _CommandDetectParser(argparse.ArgumentParser):
+    """_detect_command 用のパーサー（解析エラー時に終了せず ArgumentError を送出する）"""
+    def error(self, message):
+        raise argparse.ArgumentError(None, message)
+
+def _detect_command(argv):
+    """
+    コマンドライン引数から実行するサブコマンド名を取り出す
+
+    --env などの共通オプションの値をサブコマンド名と取り違えないよう、
+    共通オプションのみを定義したパーサーで解析する。
+
+    Args:
+        argv (list): コマンドライン引数
+
+    Returns:
+        str: サブコマンド名。特定できない場合は None（すべてのサブコマンドを構築したパーサーにエラーを表示させる）
+    """
+    parser = _CommandDetectParser(add_help=False)
+    _add_global_options(parser)
+    parser.add_argument('command', nargs='?')
+    parser.add_argument('command_args', nargs=argparse.REMAINDER)
+    try:
+        args, _ = parser.parse_known_args(argv)
+    except argparse.ArgumentError:
+        return None
+    return args.command if args.command in COMMAND_PARSERS else None
+
+# サブコマンドの処理
+def _print_result_files(label, result):
+    """
+    Excel変換処理の結果（出力ファイルのパスまたはそのリスト）を表示する
+    
+    Args:
+        label (str): 出力内容の名称（例: "ACL情報"）
+        result (str or list): 出力ファイルのパス、または複数アプリ処理時のパスのリスト
+    """
+    if not result:
+        return
+    if isinstance(result, list):
+        print(f"以下のファイルに{label}を出力しました:")
+        for file in result:
+            print(f"- {file}")
+    else:
+        print(f"{label}を {result} に出力しました")
+
+def _backup_and_strip_suffix(logger):
+    """出力ファイルをバックアップし、ファイル名から日時部分を除去する"""
+    # 処理完了後にバックアップを作成し、同じ走査結果でファイル名から日時部分を除去する
+    backup_dir = backup_and_rename(OUTPUT_DIR, BACKUP_DIR, timestamp=RUN_TIMESTAMP)
+    logger.info(f"出力ファイルを {backup_dir} にバックアップしました")
+    print(f"出力ファイルを {backup_dir} にバックアップしました")
+
+def run_users(args, config, logger):
+    """users コマンド: ユーザーとグループ情報を取得する"""
+    result = get_user_group_info(config, logger, args.format, timestamp=RUN_TIMESTAMP, cache_ttl=args.cache_ttl)
+    if result:
+        print(f"ユーザーとグループ情報を {result} に出力しました")
+
+def run_app(args, config, logger):
+    """app コマンド: アプリのJSONデータを取得する"""
+    result = get_app_json(config, logger, args.id, jobs=args.jobs)
+    if result:
+        print("アプリのJSONデータ取得が完了しました")
+        
+        # appコマンドで特定のアプリIDが指定された場合、事後処理も実行
+        if args.id:
+            _backup_and_strip_suffix(logger)
+
+def run_acl(args, config, logger):
+    """acl コマンド: ACL情報をExcelに変換する"""
+    _print_result_files("ACL情報", generate_acl_excel(config, logger, args.id, jobs=args.jobs))
+
+def run_summary(args, config, logger):
+    """summary コマンド: アプリ設定一覧表を生成する"""
+    # アプリ設定一覧表の生成
+    script_path = SCRIPT_DIR / "app_settings_summary.py"
+    
+    if not script_path.exists():
+        logger.error(f"スクリプトファイルが見つかりません: {script_path}")
+        print(f"エラー: スクリプトファイル {script_path} が見つかりません")
+        sys.exit(1)
+    
+    # スクリプトの出力はバッファせずにそのまま画面に流す
+    if not generate_app_settings_summary(logger, args.output):
+        print(f"エラー: アプリ設定一覧表の生成中にエラーが発生しました（詳細は {ERROR_REPORT_FILE} を参照してください）")
+        sys.exit(1)
+
+# group コマンドのアクションごとの (manage_groups に渡すパラメータ, 成功時に表示する内容)
+GROUP_ACTIONS = {
+    'list': (lambda args: None, lambda args, result: result),
+    'search': (lambda args: {'keyword': args.keyword}, lambda args, result: result),
+    'add': (lambda args: {'user': args.user, 'group': args.group},
+            lambda args, result: f"ユーザー {args.user} をグループ {args.group} に追加しました"),
+    'remove': (lambda args: {'user': args.user},
+               lambda args, result: f"ユーザー {args.user} をグループから削除しました"),
+}
+
+def run_group(args, config, logger):
+    """group コマンド: グループを操作する"""
+    if args.action not in GROUP_ACTIONS:
+        return
+    
+    build_params, build_message = GROUP_ACTIONS[args.action]
+    result = manage_groups(config, logger, args.action, build_params(args))
+    if result:
+        print(build_message(args, result))
+
+def run_notifications(args, config, logger):
+    """notifications コマンド: 通知設定をExcelに変換する"""
+    _print_result_files("通知設定", generate_notifications_excel(config, logger, args.id, jobs=args.jobs))
+
+def run_process_workflow(args, config, logger):
+    """process_workflow コマンド: プロセスワークフローをExcelに変換する"""
+    _print_result_files("プロセスワークフロー", generate_process_workflow_excel(config, logger, args.id, jobs=args.jobs))
+
+def _prepare_output_dirs(prepare, logger):
+    """
+    ディレクトリの準備を実行する（Excelファイルが開かれている場合は終了し、それ以外のエラーは警告して続行する）
+    
+    Args:
+        prepare (callable): prepare_directories などの準備処理
+        logger (Logger): ロガーオブジェクト
+    """
+    try:
+        prepare()
+    except ExcelFileOpenError as e:
+        logger.error(f"ディレクトリの準備中にエラーが発生しました: {e}")
+        logger.error("Excelファイルが開かれているため処理を終了します。")
+        print(f"エラー: Excelファイルが開かれているため処理を続行できません。")
+        print("Excelファイルを閉じてから再実行してください。")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"ディレクトリの準備中にエラーが発生しました: {e}")
+        # Excel以外のエラーの場合は警告を表示して続行
+        logger.warning("エラーが発生しましたが、処理を続行します。一部のファイルが正しく処理されない可能性があります。")
+        print(f"警告: ディレクトリの準備中にエラーが発生しました: {e}")
+        print("処理を続行しますが、一部のファイルが正しく処理されない可能性があります。")
+
+def _stage_result(future, label, logger):
+    """
+    all コマンドの処理結果を取り出す（想定外の例外は記録して False とし、他の処理を止めない）
+    
+    Args:
+        future (Future): 処理の Future
+        label (str): ログに出力する処理名
+        logger (Logger): ロガーオブジェクト
+    
+    Returns:
+        処理の戻り値。例外が発生した場合は False
+    """
+    try:
+        return future.result()
+    except Exception as e:
+        logger.error(f"{label}中に予期しないエラーが発生しました: {e}")
+        log_error_to_file(logger, e, context=label)
+        return False
+
+def run_all(args, config, logger):
+    """all コマンド: すべての機能を実行し、出力をバックアップする"""
+    # すべての機能を実行する
+    # 互いに依存しない処理はスレッドで並行実行し、依存関係に沿って2段階に分ける
+    #   1段目: ユーザーとグループ情報の取得、アプリのJSONデータ取得
+    #   2段目: 1段目の出力（アプリごとのディレクトリと最新のユーザー・グループExcel）を読む変換処理
+    # 並行実行中の各処理が呼び出すスクリプトは、_run_script が子プロセス（またはワーカープロセス）で実行する
+    logger.info("すべての機能を実行します")
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # 1. ユーザーとグループ情報の取得
+        user_group_future = executor.submit(get_user_group_info, config, logger, timestamp=RUN_TIMESTAMP, cache_ttl=args.cache_ttl)
+        # 2. アプリのJSONデータ取得
+        app_json_future = executor.submit(get_app_json, config, logger, jobs=args.jobs)
+        user_group_file = _stage_result(user_group_future, "ユーザーとグループ情報の取得", logger)
+        app_json_result = _stage_result(app_json_future, "アプリのJSONデータ取得", logger)
+    
+    if user_group_file:
+        print(f"ユーザーとグループ情報を {user_group_file} に出力しました")
+    if app_json_result:
+        print("アプリのJSONデータ取得が完了しました")
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        # 3. ACL情報のExcel変換
+        acl_excel_future = executor.submit(generate_acl_excel, config, logger, jobs=args.jobs)
+        # 4. アプリ設定一覧表の生成
+        summary_future = executor.submit(generate_app_settings_summary, logger)
+        # 5. 通知設定のExcel変換
+        notifications_future = executor.submit(generate_notifications_excel, config, logger, jobs=args.jobs)
+        # 6. プロセスワークフローのExcel変換
+        process_workflow_future = executor.submit(generate_process_workflow_excel, config, logger, jobs=args.jobs)
+        acl_excel_result = _stage_result(acl_excel_future, "ACL情報のExcel変換", logger)
+        _stage_result(summary_future, "アプリ設定一覧表の生成", logger)
+        notifications_result = _stage_result(notifications_future, "通知設定のExcel変換", logger)
+        process_workflow_result = _stage_result(process_workflow_future, "プロセスワークフローのExcel変換", logger)
+    
+    _print_result_files("ACL情報", acl_excel_result)
+    _print_result_files("通知設定", notifications_result)
+    _print_result_files("プロセスワークフロー", process_workflow_result)
+    
+    # allコマンドの場合はバックアップと日時部分の除去を実行
+    _backup_and_strip_suffix(logger)
+
+# サブコマンド名と処理関数の対応表（outputs は main で設定ファイルを読む前に処理する）
+COMMANDS = {
+    'users': run_users,
+    'app': run_app,
+    'acl': run_acl,
+    'summary': run_summary,
+    'group': run_group,
+    'notifications': run_notifications,
+    'process_workflow': run_process_workflow,
+    'all': run_all,
+}
+
+# output / previous_output / backup にファイルを書き込むコマンド（group は標準出力のみのため含めない）
+OUTPUT_COMMANDS = frozenset(COMMANDS) - {'group'}
+
+def main():
+    """メイン関数"""
+    argv = sys.argv[1:]
+    
     # 引数がない場合はヘルプと出力ファイル情報を表示
-    if len(sys.argv) == 1:
-        parser.print_help()
+    if not argv:
+        build_parser().print_help()
         print("\n")
         display_output_info()
         sys.exit(0)
     
-    args = parser.parse_args()
+    # 出力ファイル一覧表示の場合はパーサーを構築せずに表示
+    if argv == ['outputs']:
+        display_output_info()
+        sys.exit(0)
+    
+    # コマンドライン引数の解析（指定されたサブコマンドのパーサーのみ構築）
+    command = _detect_command(argv)
+    parser = build_parser(command)
+    args = parser.parse_args(argv)
     
     # 出力ファイル一覧表示の場合
     if args.command == 'outputs':
         display_output_info()
         sys.exit(0)
     
+    # サブコマンドが指定されていない場合（--env などのオプションのみ）はヘルプを表示して終了
+    if args.command is None:
+        parser.print_help()
+        sys.exit(0)
+    
+    # スクリプトの実行方式
+    global ISOLATE_SCRIPTS
+    ISOLATE_SCRIPTS = args.isolate
+    
     # ロギングの設定
-    logger = setup_logging()
+    logger = setup_logging(timestamp=RUN_TIMESTAMP)
     logger.info("KintoneRunnerを起動しました")
     
-    # ディレクトリの準備（allコマンドの場合のみ実行）
+    # ディレクトリの準備（all コマンドと、app コマンドでアプリIDが指定された場合のみ実行）
     if args.command == 'all':
         logger.info("ディレクトリの準備を開始します")
-        try:
-            prepare_directories()
-        except Exception as e:
-            logger.error(f"ディレクトリの準備中にエラーが発生しました: {e}")
-            # Excelファイルが開かれているかどうかを確認
-            if "~$" in str(e) or any(temp_file.startswith("~$") for temp_file in str(e).split() if temp_file.startswith("~$")):
-                logger.error("Excelファイルが開かれているため処理を終了します。")
-                print(f"エラー: Excelファイルが開かれているため処理を続行できません。")
-                print("Excelファイルを閉じてから再実行してください。")
-                sys.exit(1)
-            else:
-                # Excel以外のエラーの場合は警告を表示して続行
-                logger.warning("エラーが発生しましたが、処理を続行します。一部のファイルが正しく処理されない可能性があります。")
-                print(f"警告: ディレクトリの準備中にエラーが発生しました: {e}")
-                print("処理を続行しますが、一部のファイルが正しく処理されない可能性があります。")
-    # appコマンドの場合、特定のアプリIDのディレクトリのみ準備
+        _prepare_output_dirs(prepare_directories, logger)
     elif args.command == 'app' and args.id:
         logger.info(f"アプリID {args.id} のディレクトリ準備を開始します")
-        try:
-            prepare_app_directories(args.id)
-        except Exception as e:
-            logger.error(f"ディレクトリの準備中にエラーが発生しました: {e}")
-            # Excelファイルが開かれているかどうかを確認
-            if "~$" in str(e) or any(temp_file.startswith("~$") for temp_file in str(e).split() if temp_file.startswith("~$")):
-                logger.error("Excelファイルが開かれているため処理を終了します。")
-                print(f"エラー: Excelファイルが開かれているため処理を続行できません。")
-                print("Excelファイルを閉じてから再実行してください。")
-                sys.exit(1)
-            else:
-                # Excel以外のエラーの場合は警告を表示して続行
-                logger.warning("エラーが発生しましたが、処理を続行します。一部のファイルが正しく処理されない可能性があります。")
-                print(f"警告: ディレクトリの準備中にエラーが発生しました: {e}")
-                print("処理を続行しますが、一部のファイルが正しく処理されない可能性があります。")
+        _prepare_output_dirs(lambda: prepare_app_directories(args.id), logger)
     
-    # 最低限のディレクトリ作成を確保
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    PREVIOUS_OUTPUT_DIR.mkdir(exist_ok=True)
-    BACKUP_DIR.mkdir(exist_ok=True)
+    # 最低限のディレクトリ作成を確保（以降の処理関数はディレクトリが存在する前提で動作する）
+    if args.command in OUTPUT_COMMANDS:
+        _ensure_dirs_once()
     
     # 設定ファイルの読み込み
     env_file = Path(args.env) if args.env else ENV_FILE
     config = load_env_config(env_file)
-    if 'app_tokens' in config:
-        # アプリIDのフィルタリング
-        if args.command == 'all':
-            if hasattr(args, 'id') and args.id:
-                # --id が指定された場合、指定されたIDのみを対象とする
-                target_ids = [str(id) for id in args.id]
-                config['app_tokens'] = {k: v for k, v in config['app_tokens'].items() if str(k) in target_ids}
-            elif hasattr(args, 'not_id') and args.not_id:
-                # --not-id が指定された場合、指定されたID以外を対象とする
-                exclude_ids = [str(id) for id in args.not_id]
-                config['app_tokens'] = {k: v for k, v in config['app_tokens'].items() if str(k) not in exclude_ids}
+    # アプリIDのフィルタリング（all コマンドのみ。app_tokens のキーは文字列に揃えてある）
+    if args.command == 'all' and 'app_tokens' in config:
+        ids = getattr(args, 'id', None)
+        not_ids = getattr(args, 'not_id', None)
+        tokens = config['app_tokens']
+        if ids:
+            # --id が指定された場合、指定されたIDのみを対象とする
+            target_ids = {str(i) for i in ids}
+            tokens = {k: v for k, v in tokens.items() if k in target_ids}
+        elif not_ids:
+            # --not-id が指定された場合、指定されたID以外を対象とする
+            exclude_ids = {str(i) for i in not_ids}
+            tokens = {k: v for k, v in tokens.items() if k not in exclude_ids}
+        config['app_tokens'] = tokens
     logger.info(f"設定ファイル {env_file} を読み込みました")
     
     # コマンドに応じて処理を実行
-    if args.command == 'users':
-        result = get_user_group_info(config, logger, args.format)
-        if result:
-            print(f"ユーザーとグループ情報を {result} に出力しました")
-            
-    elif args.command == 'app':
-        result = get_app_json(config, logger, args.id)
-        if result:
-            print("アプリのJSONデータ取得が完了しました")
-            
-            # appコマンドで特定のアプリIDが指定された場合、事後処理も実行
-            if args.id:
-                # 処理完了後にバックアップを作成
-                backup_dir = backup_output()
-                logger.info(f"出力ファイルを {backup_dir} にバックアップしました")
-                print(f"出力ファイルを {backup_dir} にバックアップしました")
-                
-                # ファイル名から日時部分を除去
-                remove_datetime_suffix(OUTPUT_DIR)
-            
-    elif args.command == 'acl':
-        result = generate_acl_excel(config, logger, args.id)
-        if result:
-            if isinstance(result, list):
-                print("以下のファイルにACL情報を出力しました:")
-                for file in result:
-                    print(f"- {file}")
-            else:
-                print(f"ACL情報を {result} に出力しました")
-            
-    elif args.command == 'summary':
-        # アプリ設定一覧表の生成
-        logger.info("アプリ設定一覧表の生成を開始します")
-        script_path = SCRIPT_DIR / "app_settings_summary.py"
-        
-        if not script_path.exists():
-            logger.error(f"スクリプトファイルが見つかりません: {script_path}")
-            print(f"エラー: スクリプトファイル {script_path} が見つかりません")
-            sys.exit(1)
-        
-        cmd = [sys.executable, str(script_path)]
-        if args.output:
-            cmd.extend(["--output", args.output])
-        
-        try:
-            logger.info(f"実行コマンド: {' '.join(cmd)}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            logger.info("アプリ設定一覧表の生成が完了しました")
-            print(result.stdout)
-        except subprocess.CalledProcessError as e:
-            logger.error(f"アプリ設定一覧表の生成中にエラーが発生しました: {e}")
-            logger.error(f"標準出力: {e.stdout}")
-            logger.error(f"標準エラー: {e.stderr}")
-            log_error_to_file(
-                logger, 
-                e, 
-                command=cmd, 
-                stdout=e.stdout, 
-                stderr=e.stderr, 
-                context="アプリ設定一覧表の生成"
-            )
-            print(f"エラー: アプリ設定一覧表の生成中にエラーが発生しました: {e}")
-            sys.exit(1)
-            
-    elif args.command == 'group':
-        if args.action == 'list':
-            result = manage_groups(config, logger, 'list')
-            if result:
-                print(result)
-                
-        elif args.action == 'search':
-            result = manage_groups(config, logger, 'search', {'keyword': args.keyword})
-            if result:
-                print(result)
-                
-        elif args.action == 'add':
-            result = manage_groups(config, logger, 'add', {'user': args.user, 'group': args.group})
-            if result:
-                print(f"ユーザー {args.user} をグループ {args.group} に追加しました")
-                
-        elif args.action == 'remove':
-            result = manage_groups(config, logger, 'remove', {'user': args.user})
-            if result:
-                print(f"ユーザー {args.user} をグループから削除しました")
-                
-    elif args.command == 'notifications':
-        result = generate_notifications_excel(config, logger, args.id)
-        if result:
-            if isinstance(result, list):
-                print("以下のファイルに通知設定を出力しました:")
-                for file in result:
-                    print(f"- {file}")
-            else:
-                print(f"通知設定を {result} に出力しました")
-
-    elif args.command == 'process_workflow':
-        result = generate_process_workflow_excel(config, logger, args.id)
-        if result:
-            if isinstance(result, list):
-                print("以下のファイルにプロセスワークフローを出力しました:")
-                for file in result:
-                    print(f"- {file}")
-            
-    elif args.command == 'all':
-        # すべての機能を順番に実行
-        logger.info("すべての機能を順番に実行します")
-        
-        # 1. ユーザーとグループ情報の取得
-        user_group_file = get_user_group_info(config, logger)
-        if user_group_file:
-            print(f"ユーザーとグループ情報を {user_group_file} に出力しました")
-        
-        # 2. アプリのJSONデータ取得
-        app_json_result = get_app_json(config, logger)
-        if app_json_result:
-            print("アプリのJSONデータ取得が完了しました")
-        
-        # 3. ACL情報のExcel変換
-        acl_excel_result = generate_acl_excel(config, logger)
-        if acl_excel_result:
-            if isinstance(acl_excel_result, list):
-                print("以下のファイルにACL情報を出力しました:")
-                for file in acl_excel_result:
-                    print(f"- {file}")
-            else:
-                print(f"ACL情報を {acl_excel_result} に出力しました")
-        
-        # 4. アプリ設定一覧表の生成
-        logger.info("アプリ設定一覧表の生成を開始します")
-        script_path = SCRIPT_DIR / "app_settings_summary.py"
-        
-        if script_path.exists():
-            cmd = [sys.executable, str(script_path)]
-            try:
-                logger.info(f"実行コマンド: {' '.join(cmd)}")
-                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-                logger.info("アプリ設定一覧表の生成が完了しました")
-                print(result.stdout)
-            except subprocess.CalledProcessError as e:
-                logger.error(f"アプリ設定一覧表の生成中にエラーが発生しました: {e}")
-                logger.warning("処理を続行します")
-        else:
-            logger.warning(f"スクリプトファイル {script_path} が見つからないため、アプリ設定一覧表の生成をスキップします")
-        
-        # 5. 通知設定のExcel変換
-        notifications_result = generate_notifications_excel(config, logger)
-        if notifications_result:
-            if isinstance(notifications_result, list):
-                print("以下のファイルに通知設定を出力しました:")
-                for file in notifications_result:
-                    print(f"- {file}")
-            else:
-                print(f"通知設定を {notifications_result} に出力しました")
-        
-        # 6. プロセスワークフローのExcel変換
-        process_workflow_result = generate_process_workflow_excel(config, logger)
-        if process_workflow_result:
-            if isinstance(process_workflow_result, list):
-                print("以下のファイルにプロセスワークフローを出力しました:")
-                for file in process_workflow_result:
-                    print(f"- {file}")
-            else:
-                print(f"プロセスワークフローを {process_workflow_result} に出力しました")
-        
-   
-    # allコマンドの場合のみバックアップと日時部分の除去を実行
-    if args.command == 'all':
-        # 処理完了後にバックアップを作成
-        backup_dir = backup_output()
-        logger.info(f"出力ファイルを {backup_dir} にバックアップしました")
-        print(f"出力ファイルを {backup_dir} にバックアップしました")
-        
-        # ファイル名から日時部分を除去
-        remove_datetime_suffix(OUTPUT_DIR)
+    COMMANDS[args.command](args, config, logger)
     
     logger.info("KintoneRunnerを終了します")
 